@@ -1,4 +1,5 @@
 import sys
+import multiprocessing
 from PySide6.QtWidgets import QApplication
 from tagqt.ui.main import MainWindow
 from tagqt.ui.theme import Theme
@@ -12,4 +13,6 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    # Folder scans parse tags in worker processes, which frozen builds must bootstrap
+    multiprocessing.freeze_support()
     main()
@@ -1,19 +1,29 @@
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from PIL import Image
+import json
+import time
 from io import BytesIO
+from tagqt.core.webcache import response_cache, IMAGE_TTL, MUSICBRAINZ_TTL, SEARCH_TTL
 
 class CoverArtManager:
     ITUNES_API_URL = "https://itunes.apple.com/search"
 
     def __init__(self):
-        self.session = requests.Session()
-        retries = Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504])
-        self.session.mount('https://', HTTPAdapter(max_retries=retries))
-        self.session.mount('http://', HTTPAdapter(max_retries=retries))
+        self._session = None
+
+    @property
+    def session(self):
+        # requests and urllib3 are slow to import, so they are loaded on the first lookup instead of at startup
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            self._session = requests.Session()
+            retries = Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504])
+            self._session.mount('https://', HTTPAdapter(max_retries=retries))
+            self._session.mount('http://', HTTPAdapter(max_retries=retries))
+        return self._session
 
     def _retry(self, func, max_retries=3):
+        import requests
         for attempt in range(max_retries):
             try:
                 return func()
@@ -27,15 +37,14 @@ class CoverArtManager:
 
     def download_and_process_cover(self, url):
         def do_download():
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            return response.content
+            return response_cache().get(self.session, url, ttl=IMAGE_TTL, timeout=15)
 
         content = self._retry(do_download)
         if not content:
             return None
 
         try:
+            from PIL import Image
             img = Image.open(BytesIO(content))
             img = img.convert("RGB")
             img = img.resize((500, 500), Image.Resampling.LANCZOS)
@@ -57,9 +66,8 @@ class CoverArtManager:
             }
             headers = {"User-Agent": "tagqt/1.0 ( contact@example.com )"}
             
-            response = self.session.get(url, params=params, headers=headers, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return json.loads(response_cache().get(self.session, url, params=params, headers=headers,
+                                                   ttl=MUSICBRAINZ_TTL, timeout=10))
 
         data = self._retry(do_search)
         if data and data.get("release-groups"):
@@ -89,9 +97,8 @@ class CoverArtManager:
                 "entity": "album",
                 "limit": 5 # Get a few
             }
-            response = self.session.get(self.ITUNES_API_URL, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = json.loads(response_cache().get(self.session, self.ITUNES_API_URL, params=params,
+                                                   ttl=SEARCH_TTL, timeout=10))
             
             for item in data.get("results", []):
                 url = item.get("artworkUrl100")
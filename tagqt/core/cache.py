@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+CACHE_DIR = os.path.expanduser("~/.config/TagQt/cache")
+
+
+class DiskCache:
+    """Byte values in files under cache_dir, least recently used evicted past max_bytes.
+
+    Keys are hex strings such as digest() returns. The modification time of
+    an entry doubles as its last use. The stored bytes are opaque to the
+    cache; writes are atomic, so readers never see half an entry.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._total = None # bytes on disk, counted on the first write
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(text):
+        return hashlib.sha1(text.encode('utf-8', 'surrogateescape')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def put(self, key, data):
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Error writing cache entry: {e}")
+            return
+        with self._lock:
+            if self._total is None:
+                self._total = sum(size for _, size, _ in self._entries())
+            else:
+                self._total += len(data)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
+
+    def remove(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _entries(self):
+        """(mtime, size, path) of every stored entry."""
+        entries = []
+        try:
+            subdirs = os.listdir(self.cache_dir)
+        except OSError:
+            return entries
+        for subdir in subdirs:
+            try:
+                with os.scandir(os.path.join(self.cache_dir, subdir)) as it:
+                    for entry in it:
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+            except OSError:
+                continue
+        return entries
+
+    def _evict(self):
+        # Down to 80% so the next few writes do not scan the directory again
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.8
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._total = total
+
+
+class JsonCache:
+    """JSON values by name on disk, each remembering when it was stored.
+
+    Entries past their time to live are not returned by get(), but stay on
+    disk until evicted; entry() still reads them, e.g. to revalidate.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.files = DiskCache(cache_dir, max_bytes)
+
+    def entry(self, name):
+        """The stored dict of name: 'time', 'value' and any extra fields, or None."""
+        data = self.files.get(DiskCache.digest(name))
+        if data is None:
+            return None
+        try:
+            entry = json.loads(data)
+        except ValueError:
+            return None
+        # The file name is a digest of name, the name itself is checked too
+        if not isinstance(entry, dict) or entry.get('name') != name:
+            return None
+        return entry
+
+    def get(self, name, ttl):
+        """The value stored for name if it is at most ttl seconds old, else None."""
+        entry = self.entry(name)
+        if entry is None or time.time() - entry.get('time', 0) > ttl:
+            return None
+        return entry.get('value')
+
+    def put(self, name, value, **extra):
+        entry = dict(extra, name=name, time=time.time(), value=value)
+        self.files.put(DiskCache.digest(name), json.dumps(entry, separators=(',', ':')).encode('utf-8'))
@@ -2,35 +2,37 @@ import csv
 import os
 
 
-def export_metadata_to_csv(files_data, filepath):
-    if not files_data:
-        return False, "No files to export"
-    
-    fieldnames = ['filepath', 'filename', 'title', 'artist', 'album', 'album_artist', 
-                  'year', 'genre', 'disc_number', 'track_number', 'bpm', 'initial_key', 'comment', 'lyrics']
-    
+CSV_FIELDS = ['filepath', 'filename', 'title', 'artist', 'album', 'album_artist',
+              'year', 'genre', 'disc_number', 'track_number', 'bpm', 'initial_key', 'comment', 'lyrics']
+
+
+def metadata_row(path, meta, lyrics=""):
+    """The CSV row of one file. meta: TrackRecord or MetadataHandler; a TrackRecord has no lyrics."""
+    return {
+        'filepath': path,
+        'filename': os.path.basename(path),
+        'title': meta.title or '',
+        'artist': meta.artist or '',
+        'album': meta.album or '',
+        'album_artist': meta.album_artist or '',
+        'year': meta.year or '',
+        'genre': meta.genre or '',
+        'disc_number': meta.disc_number or '',
+        'track_number': meta.track_number or '',
+        'bpm': meta.bpm or '',
+        'initial_key': meta.initial_key or '',
+        'comment': meta.comment or '',
+        'lyrics': lyrics or ''
+    }
+
+
+def export_metadata_to_csv(rows, filepath):
+    """rows: iterable of metadata_row() dicts, written as they are produced."""
     try:
         with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
             writer.writeheader()
-            
-            for path, meta in files_data:
-                row = {
-                    'filepath': path,
-                    'filename': os.path.basename(path),
-                    'title': meta.title or '',
-                    'artist': meta.artist or '',
-                    'album': meta.album or '',
-                    'album_artist': meta.album_artist or '',
-                    'year': meta.year or '',
-                    'genre': meta.genre or '',
-                    'disc_number': meta.disc_number or '',
-                    'track_number': meta.track_number or '',
-                    'bpm': meta.bpm or '',
-                    'initial_key': meta.initial_key or '',
-                    'comment': meta.comment or '',
-                    'lyrics': meta.lyrics or ''
-                }
+            for row in rows:
                 writer.writerow(row)
         return True, None
     except Exception as e:
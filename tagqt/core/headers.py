@@ -0,0 +1,324 @@
+import struct
+
+# Vorbis comment key -> TrackRecord field, matching what MetadataHandler returns
+VORBIS_FIELDS = {
+    'title': 'title',
+    'artist': 'artist',
+    'album': 'album',
+    'albumartist': 'album_artist',
+    'date': 'year',
+    'genre': 'genre',
+    'discnumber': 'disc_number',
+    'tracknumber': 'track_number',
+    'bpm': 'bpm',
+    'initialkey': 'initial_key',
+    'comment': 'comment',
+}
+
+# ID3v2.3/2.4 frame -> TrackRecord field, as mapped by EasyID3
+ID3_FIELDS = {
+    'TIT2': 'title',
+    'TPE1': 'artist',
+    'TALB': 'album',
+    'TPE2': 'album_artist',
+    'TDRC': 'year',
+    'TCON': 'genre',
+    'TPOS': 'disc_number',
+    'TRCK': 'track_number',
+    'TBPM': 'bpm',
+}
+
+# v2.3 date frames, folded into TDRC the way mutagen upgrades them
+ID3_V23_DATE_FRAMES = ('TYER', 'TDAT', 'TIME')
+
+ID3_ENCODINGS = {0: 'latin-1', 1: 'utf-16', 2: 'utf-16-be', 3: 'utf-8'}
+
+# Leading bytes of the image formats found in cover art
+IMAGE_MAGIC = (b'\xff\xd8', b'\x89PNG', b'GIF8', b'BM', b'RIFF')
+
+
+def read_tags(path):
+    """Reads the list columns of path from its tag block alone.
+
+    Embedded pictures, lyrics and the audio stream are seeked over instead of
+    loaded; for the first picture only its location, byte size and
+    dimensions are recorded (see read_cover()). MP3 audio info comes from
+    the first frames after the tag. Returns None for anything this reader
+    does not handle (other formats, ID3v2.2, unsynchronised or compressed
+    frames) so the caller can fall back to MetadataHandler.
+    """
+    try:
+        with open(path, 'rb') as f:
+            magic = f.read(4)
+            f.seek(0)
+            if magic == b'fLaC':
+                return _read_flac(f)
+            if magic[:3] == b'ID3' and path.lower().endswith('.mp3'):
+                fields = _read_id3(f)
+                if fields is not None:
+                    fields.update(_mpeg_info(f))
+                return fields
+    except (OSError, ValueError, IndexError, struct.error, UnicodeDecodeError):
+        pass
+    return None
+
+
+def _mpeg_info(f):
+    """Returns {'duration', 'bitrate', 'sample_rate'} in MetadataHandler units (s, kbps, kHz)."""
+    info = None
+    try:
+        from mutagen.mp3 import MPEGInfo
+        # Skip the tag so only the first audio frames are read
+        info = MPEGInfo(f, _id3_size(f))
+    except Exception as e:
+        print(f"Error reading audio info for {getattr(f, 'name', f)}: {e}")
+    if info is None:
+        return {'duration': 0, 'bitrate': 0, 'sample_rate': 0}
+    return {
+        'duration': int(getattr(info, 'length', 0) or 0),
+        'bitrate': int((getattr(info, 'bitrate', 0) or 0) / 1000),
+        'sample_rate': int((getattr(info, 'sample_rate', 0) or 0) / 1000),
+    }
+
+
+def read_cover(path, offset, size):
+    """Reads size bytes of cover art at offset, or None if they are not an image (file changed since the scan)."""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read(size)
+    except OSError:
+        return None
+    if len(data) != size or not data.startswith(IMAGE_MAGIC):
+        return None
+    return data
+
+
+def image_size(f, offset=0):
+    """Returns (width, height) from a PNG, GIF or JPEG header at offset, or (0, 0).
+
+    Only the header is read; JPEG segments are seeked over up to the frame header.
+    """
+    f.seek(offset)
+    head = f.read(26)
+    if head.startswith(b'\x89PNG') and len(head) >= 24:
+        return struct.unpack('>II', head[16:24])
+    if head.startswith(b'GIF8') and len(head) >= 10:
+        return struct.unpack('<HH', head[6:10])
+    if not head.startswith(b'\xff\xd8'):
+        return (0, 0)
+    f.seek(offset + 2)
+    for _ in range(64):
+        marker = f.read(4)
+        if len(marker) < 4 or marker[0] != 0xFF:
+            break
+        length = struct.unpack('>H', marker[2:4])[0]
+        # SOF0-SOF15, except DHT (C4), JPG (C8) and DAC (CC)
+        if 0xC0 <= marker[1] <= 0xCF and marker[1] not in (0xC4, 0xC8, 0xCC):
+            frame = f.read(5)
+            if len(frame) == 5:
+                height, width = struct.unpack('>HH', frame[1:5])
+                return (width, height)
+            break
+        f.seek(length - 2, 1)
+    return (0, 0)
+
+
+def _empty_cover():
+    return {'cover_offset': None, 'cover_size': 0, 'cover_width': 0, 'cover_height': 0}
+
+
+def _read_flac(f):
+    f.seek(4)
+    fields = _empty_cover()
+    comments = {}
+    info = {}
+    while True:
+        header = f.read(4)
+        if len(header) < 4:
+            return None
+        is_last = header[0] & 0x80
+        block_type = header[0] & 0x7F
+        size = int.from_bytes(header[1:4], 'big')
+        if block_type == 0:
+            info = _parse_streaminfo(f.read(size))
+        elif block_type == 4:
+            comments = _parse_vorbis_comment(f.read(size))
+        elif block_type == 6 and not fields['cover_size']:
+            block_end = f.tell() + size
+            fields.update(_parse_picture_header(f))
+            f.seek(block_end)
+        else:
+            # Padding, seek tables, further pictures: skip without reading
+            f.seek(size, 1)
+        if is_last:
+            break
+    audio_start = f.tell()
+
+    for key, field in VORBIS_FIELDS.items():
+        values = comments.get(key)
+        fields[field] = values[0] if values else ""
+    if '/' not in fields['disc_number'] and 'disctotal' in comments:
+        fields['disc_number'] = f"{fields['disc_number']}/{comments['disctotal'][0]}"
+
+    if info:
+        f.seek(0, 2)
+        length = info['length']
+        fields['duration'] = int(length)
+        fields['sample_rate'] = int(info['sample_rate'] / 1000)
+        fields['bitrate'] = int((f.tell() - audio_start) * 8 / length / 1000) if length else 0
+    return fields
+
+
+def _parse_streaminfo(data):
+    if len(data) < 18:
+        return {}
+    packed = int.from_bytes(data[10:18], 'big')
+    sample_rate = packed >> 44
+    total_samples = packed & 0xFFFFFFFFF
+    return {
+        'sample_rate': sample_rate,
+        'length': total_samples / sample_rate if sample_rate else 0,
+    }
+
+
+def _parse_picture_header(f):
+    # type, MIME and description come before the dimensions and the image data
+    f.seek(4, 1)
+    mime_length = struct.unpack('>I', f.read(4))[0]
+    f.seek(mime_length, 1)
+    desc_length = struct.unpack('>I', f.read(4))[0]
+    f.seek(desc_length, 1)
+    width, height, _depth, _colors, size = struct.unpack('>5I', f.read(20))
+    offset = f.tell()
+    if not width or not height:
+        # Writers may leave the dimensions at zero, take them from the image itself
+        width, height = image_size(f, offset)
+    return {'cover_offset': offset, 'cover_size': size, 'cover_width': width, 'cover_height': height}
+
+
+def _parse_vorbis_comment(data):
+    comments = {}
+    vendor_length = struct.unpack_from('<I', data, 0)[0]
+    offset = 4 + vendor_length
+    count = struct.unpack_from('<I', data, offset)[0]
+    offset += 4
+    for _ in range(count):
+        length = struct.unpack_from('<I', data, offset)[0]
+        offset += 4
+        entry = data[offset:offset + length].decode('utf-8', 'replace')
+        offset += length
+        key, sep, value = entry.partition('=')
+        if sep:
+            comments.setdefault(key.lower(), []).append(value)
+    return comments
+
+
+def _syncsafe(data):
+    return (data[0] << 21) | (data[1] << 14) | (data[2] << 7) | data[3]
+
+
+def _id3_size(f):
+    f.seek(0)
+    header = f.read(10)
+    if len(header) < 10 or header[:3] != b'ID3':
+        return 0
+    size = 10 + _syncsafe(header[6:10])
+    if header[5] & 0x10:
+        size += 10 # footer
+    return size
+
+
+def _read_id3(f):
+    header = f.read(10)
+    version = header[3]
+    flags = header[5]
+    if version not in (3, 4) or flags & 0x80:
+        # v2.2 and whole-tag unsynchronisation are left to mutagen
+        return None
+    end = 10 + _syncsafe(header[6:10])
+
+    if flags & 0x40:
+        ext = f.read(4)
+        ext_size = _syncsafe(ext) if version == 4 else struct.unpack('>I', ext)[0] + 4
+        f.seek(ext_size - 4, 1)
+
+    frames = {}
+    cover = _empty_cover()
+    while f.tell() + 10 <= end:
+        frame_header = f.read(10)
+        frame_id = frame_header[:4]
+        if frame_id[:1] == b'\0':
+            break # padding
+        size = _syncsafe(frame_header[4:8]) if version == 4 else struct.unpack('>I', frame_header[4:8])[0]
+        frame_id = frame_id.decode('latin-1')
+        if frame_id in ID3_FIELDS or frame_id in ID3_V23_DATE_FRAMES:
+            format_flags = frame_header[9]
+            # Compressed, encrypted, grouped or unsynchronised frames (v2.3 / v2.4 bits)
+            if (version == 3 and format_flags & 0xE0) or (version == 4 and format_flags & 0x4F):
+                return None
+            frames[frame_id] = _decode_text_frame(f.read(size))
+        elif frame_id == 'APIC' and not cover['cover_size']:
+            frame_end = f.tell() + size
+            if frame_header[9] & (0xE0 if version == 3 else 0x4F):
+                # The stored bytes are not the image, it is read through mutagen
+                cover['cover_size'] = size
+            else:
+                cover.update(_parse_apic_header(f, size))
+            f.seek(frame_end)
+        else:
+            # USLT, further pictures and everything else are skipped without reading
+            f.seek(size, 1)
+
+    if 'TDRC' not in frames and frames.get('TYER'):
+        date = frames['TYER']
+        tdat = frames.get('TDAT', '')
+        if len(tdat) == 4:
+            date += f"-{tdat[2:]}-{tdat[:2]}"
+            time = frames.get('TIME', '')
+            if len(time) == 4:
+                date += f"T{time[:2]}:{time[2:]}:00"
+        frames['TDRC'] = date
+    if frames.get('TCON'):
+        from mutagen.id3 import TCON
+        # Resolves numeric ID3v1 genre references like "(17)"
+        genres = TCON(encoding=3, text=[frames['TCON']]).genres
+        frames['TCON'] = genres[0] if genres else ""
+
+    fields = {field: frames.get(frame_id, "") for frame_id, field in ID3_FIELDS.items()}
+    fields['initial_key'] = ""
+    fields['comment'] = ""
+    fields.update(cover)
+    return fields
+
+
+def _parse_apic_header(f, size):
+    start = f.tell()
+    head = f.read(min(size, 1024))
+    encoding = head[0]
+    mime_end = head.index(b'\0', 1)
+    # Description follows the picture type byte, NUL terminated in the frame's encoding
+    if encoding in (1, 2):
+        desc_end = mime_end + 2
+        while head[desc_end:desc_end + 2] != b'\0\0':
+            desc_end += 2
+            if desc_end + 2 > len(head):
+                raise ValueError("APIC description too long")
+        data_start = desc_end + 2
+    else:
+        data_start = head.index(b'\0', mime_end + 2) + 1
+    offset = start + data_start
+    width, height = image_size(f, offset)
+    return {'cover_offset': offset, 'cover_size': size - data_start,
+            'cover_width': width, 'cover_height': height}
+
+
+def _decode_text_frame(data):
+    if not data:
+        return ""
+    encoding = ID3_ENCODINGS.get(data[0])
+    if encoding is None:
+        raise ValueError("unknown text encoding")
+    text = data[1:].decode(encoding)
+    # Multiple values are NUL separated, the list only shows the first
+    return text.split('\0')[0]
@@ -0,0 +1,335 @@
+import os
+import sqlite3
+
+LIBRARY_DB = os.path.expanduser("~/.config/TagQt/library.db")
+
+TAG_FIELDS = ['title', 'artist', 'album', 'album_artist', 'year', 'genre',
+              'disc_number', 'track_number', 'bpm', 'initial_key', 'comment']
+INFO_FIELDS = ['duration', 'bitrate', 'sample_rate', 'filesize']
+KEY_FIELDS = ['mtime', 'size', 'inode']
+# Where the first embedded picture sits in the file; offset is None when only mutagen can extract it
+COVER_FIELDS = ['cover_offset', 'cover_size', 'cover_width', 'cover_height']
+
+
+def file_key(st):
+    """Identity of a file on disk; any change means the cached tags are stale."""
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class TrackRecord:
+    """Displayed tag fields and audio specs of one file.
+
+    The file list keeps one of these per track instead of a MetadataHandler,
+    so cover art, lyrics and the mutagen objects are not held in memory.
+    Lyrics are not part of it at all, open() the file to read them.
+    Only the cover's location is kept, read_cover() fetches the bytes.
+    Use open() to get the full handler when a file is edited.
+    """
+    __slots__ = ['path'] + TAG_FIELDS + INFO_FIELDS + COVER_FIELDS
+
+    def __init__(self, path, **fields):
+        self.path = path
+        for name in TAG_FIELDS:
+            setattr(self, name, fields.get(name) or "")
+        for name in INFO_FIELDS:
+            setattr(self, name, fields.get(name) or 0)
+        self.cover_offset = fields.get('cover_offset')
+        self.cover_size = fields.get('cover_size') or 0
+        self.cover_width = fields.get('cover_width') or 0
+        self.cover_height = fields.get('cover_height') or 0
+
+    @classmethod
+    def from_metadata(cls, path, md):
+        fields = {name: getattr(md, name) for name in TAG_FIELDS + INFO_FIELDS}
+        cover = md.get_cover()
+        if cover:
+            import io
+            from tagqt.core.headers import image_size
+            fields['cover_size'] = len(cover)
+            fields['cover_width'], fields['cover_height'] = image_size(io.BytesIO(cover))
+        return cls(path, **fields)
+
+    @classmethod
+    def from_file(cls, path):
+        from tagqt.core.headers import read_tags
+        fields = read_tags(path)
+        if fields is None:
+            from tagqt.core.tags import MetadataHandler
+            return cls.from_metadata(path, MetadataHandler(path))
+        fields['filesize'] = round(os.path.getsize(path) / (1024 * 1024), 2)
+        return cls(path, **fields)
+
+    def open(self):
+        from tagqt.core.tags import MetadataHandler
+        return MetadataHandler(self.path)
+
+    @property
+    def has_cover(self):
+        return self.cover_size > 0
+
+    def read_cover(self):
+        """Returns the embedded cover bytes, reading only them from disk when their location is known."""
+        if not self.has_cover:
+            return None
+        if self.cover_offset is not None:
+            from tagqt.core.headers import read_cover
+            data = read_cover(self.path, self.cover_offset, self.cover_size)
+            if data:
+                return data
+        return self.open().get_cover()
+
+    def values(self):
+        """Values in TAG_FIELDS + INFO_FIELDS + COVER_FIELDS order."""
+        return [getattr(self, name) for name in TAG_FIELDS + INFO_FIELDS + COVER_FIELDS]
+
+
+class LibraryIndex:
+    # 3: MP3 rows carry their audio info, version 2 left it empty
+    SCHEMA_VERSION = 3
+    COLUMNS = ['path'] + KEY_FIELDS + TAG_FIELDS + INFO_FIELDS + COVER_FIELDS
+
+    def __init__(self, db_path=LIBRARY_DB):
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._ensure_schema()
+
+    def _ensure_schema(self):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.SCHEMA_VERSION:
+            # The index is only a cache of what is on disk, so an outdated
+            # layout is simply dropped and rebuilt by the next scan.
+            self.conn.execute("DROP TABLE IF EXISTS tracks")
+        columns = ", ".join(
+            ["path TEXT PRIMARY KEY"] +
+            [f"{name} INTEGER" for name in KEY_FIELDS] +
+            [f"{name} TEXT" for name in TAG_FIELDS] +
+            [f"{name} {'REAL' if name == 'filesize' else 'INTEGER'}" for name in INFO_FIELDS] +
+            [f"{name} INTEGER" for name in COVER_FIELDS]
+        )
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS tracks ({columns})")
+        self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    @staticmethod
+    def _prefix_range(root):
+        # Everything under root sorts between "root/" and "root0" ("0" follows "/"),
+        # which lets the primary key index answer subtree queries.
+        prefix = os.path.join(os.path.abspath(root), "")
+        return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+    def get_entries(self, root):
+        """Returns {path: (key, TrackRecord)} for every indexed file under root."""
+        low, high = self._prefix_range(root)
+        fields = TAG_FIELDS + INFO_FIELDS + COVER_FIELDS
+        rows = self.conn.execute(
+            f"SELECT path, mtime, size, inode, {', '.join(fields)} FROM tracks "
+            "WHERE path >= ? AND path < ?",
+            (low, high))
+        return {row[0]: (tuple(row[1:4]), TrackRecord(row[0], **dict(zip(fields, row[4:]))))
+                for row in rows}
+
+    def store(self, entries):
+        """entries: iterable of (TrackRecord, key) where key comes from file_key()."""
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        self.conn.executemany(
+            f"INSERT OR REPLACE INTO tracks ({', '.join(self.COLUMNS)}) VALUES ({placeholders})",
+            ([record.path, *key] + record.values() for record, key in entries))
+        self.conn.commit()
+
+    def remove(self, paths):
+        self.conn.executemany("DELETE FROM tracks WHERE path = ?", ((p,) for p in paths))
+        self.conn.commit()
+
+
+class LibrarySession:
+    """The set of root folders loaded together into one view.
+
+    Roots never overlap: adding a folder inside an existing root is refused,
+    and adding a parent of existing roots absorbs them.
+    """
+
+    def __init__(self, roots=()):
+        self.roots = []
+        for root in roots:
+            self.add(root)
+
+    @staticmethod
+    def _contains(root, path):
+        return path == root or path.startswith(os.path.join(root, ""))
+
+    def add(self, root):
+        """Adds root, returning (added, absorbed) where absorbed lists the roots it now covers."""
+        root = os.path.abspath(root)
+        if self.root_of(root):
+            return False, []
+        absorbed = [r for r in self.roots if self._contains(root, r)]
+        self.roots = [r for r in self.roots if r not in absorbed] + [root]
+        return True, absorbed
+
+    def remove(self, root):
+        root = os.path.abspath(root)
+        if root in self.roots:
+            self.roots.remove(root)
+
+    def root_of(self, path):
+        """Returns the root that path lies under, or None."""
+        path = os.path.abspath(path)
+        for root in self.roots:
+            if self._contains(root, path):
+                return root
+        return None
+
+    def clear(self):
+        self.roots = []
+
+
+def read_tracks(paths):
+    """Parses a batch of files into (path, TrackRecord, error) tuples.
+
+    Runs inside scan worker processes, so it returns plain picklable records
+    instead of MetadataHandler objects.
+    """
+    results = []
+    for path in paths:
+        try:
+            results.append((path, TrackRecord.from_file(path), None))
+        except Exception as e:
+            results.append((path, None, str(e)))
+    return results
+
+
+def parse_tracks(paths, workers, stop_event, chunk_size=64):
+    """Yields lists of (path, TrackRecord, error) as batches of paths are parsed.
+
+    paths may be any iterable, including a generator that is still scanning
+    the disk. It is iterated on a feeder thread, so the parse never waits
+    for the scan: whenever a worker process is free it gets the paths found
+    so far, up to chunk_size of them, and finished batches are yielded as
+    soon as they are ready. Only a couple of batches per worker are in
+    flight at once, and the feeder checks stop_event between paths, so
+    setting it stops both quickly. The first few batches are parsed inline;
+    the pool is only started once the scan turns out bigger, since starting
+    it costs more than small scans save. If a worker process dies, the
+    batches still in flight and the rest of the scan are parsed inline.
+    """
+    import collections
+    import queue
+    import threading
+
+    found = queue.Queue()
+    end = object()
+    halt = threading.Event() # the caller stopped iterating
+    errors = []
+
+    def feed():
+        try:
+            for path in paths:
+                if stop_event.is_set() or halt.is_set():
+                    break
+                found.put(path)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            found.put(end)
+
+    threading.Thread(target=feed, name="parse_tracks feeder", daemon=True).start()
+
+    buffer = collections.deque()
+    taken = 0
+    exhausted = False
+
+    def take(timeout):
+        """Moves the paths found so far into buffer, waiting up to timeout for the first one."""
+        nonlocal taken, exhausted
+        try:
+            item = found.get(timeout=timeout) if timeout else found.get_nowait()
+            while item is not end:
+                buffer.append(item)
+                taken += 1
+                item = found.get_nowait()
+            exhausted = True
+        except queue.Empty:
+            pass
+
+    def next_chunk():
+        return [buffer.popleft() for _ in range(min(chunk_size, len(buffer)))]
+
+    executor = None
+    pool_broken = False
+    pending = {} # future -> the paths it parses
+
+    def abandon_pool(e):
+        """Puts the paths of the unfinished batches back to be parsed inline."""
+        nonlocal executor, pool_broken
+        print(f"Scan worker process failed, parsing the rest here: {e}")
+        for chunk in pending.values():
+            buffer.extendleft(reversed(chunk))
+        pending.clear()
+        executor.shutdown(wait=False, cancel_futures=True)
+        executor = None
+        pool_broken = True
+
+    try:
+        while not exhausted or buffer or pending:
+            # Block on the scan only when there is nothing else to do
+            take(0.2 if not exhausted and not buffer and not pending else 0)
+            if stop_event.is_set():
+                return
+
+            if executor is None:
+                if workers > 1 and not pool_broken and taken > chunk_size * 4:
+                    import multiprocessing
+                    from concurrent.futures import ProcessPoolExecutor
+                    # Forking a process that runs Qt threads is unsafe, always start fresh interpreters
+                    executor = ProcessPoolExecutor(max_workers=workers,
+                                                   mp_context=multiprocessing.get_context("spawn"))
+                elif buffer:
+                    yield read_tracks(next_chunk())
+                    continue
+                else:
+                    continue
+
+            from concurrent.futures import FIRST_COMPLETED, wait
+            from concurrent.futures.process import BrokenProcessPool
+            try:
+                while buffer and len(pending) < workers * 2:
+                    chunk = next_chunk()
+                    try:
+                        pending[executor.submit(read_tracks, chunk)] = chunk
+                    except BrokenProcessPool:
+                        buffer.extendleft(reversed(chunk))
+                        raise
+            except BrokenProcessPool as e:
+                abandon_pool(e)
+                continue
+            if not pending:
+                continue
+            # With a free worker, look for newly found paths again soon
+            timeout = 0.2 if len(pending) >= workers * 2 or exhausted else 0.05
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if stop_event.is_set():
+                return
+            broken = None
+            for future in done:
+                try:
+                    result = future.result()
+                except BrokenProcessPool as e:
+                    broken = e
+                    continue
+                del pending[future]
+                yield result
+            if broken is not None:
+                abandon_pool(broken)
+        if errors:
+            raise errors[0]
+    finally:
+        halt.set()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
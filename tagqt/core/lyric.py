@@ -1,33 +1,95 @@
-import requests
+import json
+import threading
+from tagqt.core.webcache import response_cache, LYRICS_TTL, MAX_PER_HOST
+
 
 class LyricsFetcher:
     BASE_URL = "https://lrclib.net/api/search"
+    GET_URL = "https://lrclib.net/api/get"
+
+    def __init__(self):
+        self._session = None
+        self._lock = threading.Lock() # batch lookups run on several threads
+
+    @property
+    def session(self):
+        # One keep-alive connection pool shared by every lookup, sized for the concurrent ones
+        with self._lock:
+            if self._session is None:
+                # Imported here so requests is not loaded at startup
+                import requests
+                from requests.adapters import HTTPAdapter
+                self._session = requests.Session()
+                self._session.mount('https://', HTTPAdapter(pool_maxsize=MAX_PER_HOST))
+                self._session.mount('http://', HTTPAdapter(pool_maxsize=MAX_PER_HOST))
+            return self._session
+
+    @staticmethod
+    def _result(item):
+        return {
+            "id": item.get("id"),
+            "trackName": item.get("trackName"),
+            "artistName": item.get("artistName"),
+            "albumName": item.get("albumName"),
+            "duration": item.get("duration"),
+            "syncedLyrics": item.get("syncedLyrics"),
+            "plainLyrics": item.get("plainLyrics"),
+            "isSynced": bool(item.get("syncedLyrics"))
+        }
+
+    def get_lyrics(self, artist, title, album, duration):
+        """The lrclib record for exactly this track, or None.
+
+        lrclib matches the duration within a couple of seconds. One small
+        response instead of a page of search results; misses are cached
+        too, so a re-run does not ask again.
+        """
+        import requests
+        params = {
+            "artist_name": artist,
+            "track_name": title,
+            "album_name": album,
+            "duration": int(round(duration)),
+        }
+        try:
+            body = response_cache().get(self.session, self.GET_URL, params=params, ttl=LYRICS_TTL,
+                                        timeout=10, keep_not_found=True)
+            if body is None:
+                return None
+            return self._result(json.loads(body))
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Error fetching lyrics: {e}")
+            return None
+
+    def search_lyrics(self, artist, title, album=None, duration=None):
+        """Lyrics candidates for a track.
+
+        With the album and duration known, lrclib's exact lookup is tried
+        first; a record with synced lyrics is the only candidate then.
+        Otherwise, or when it only has plain lyrics, the full text search
+        runs as well.
+        """
+        exact = None
+        if artist and title and album and duration:
+            exact = self.get_lyrics(artist, title, album, duration)
+            if exact is not None and exact["isSynced"]:
+                return [exact]
+        results = self._search(artist, title)
+        if exact is not None and exact["plainLyrics"]:
+            # Kept as a candidate, behind any synced lyrics the search found
+            results = [exact] + [r for r in results if r["id"] != exact["id"]]
+        return results
 
-    def search_lyrics(self, artist, title, album=None):
+    def _search(self, artist, title):
+        import requests
         params = {
             "q": f"{artist} {title}",
         }
         
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Filter/Process results
-            results = []
-            for item in data:
-                # Basic filtering if needed, but search usually returns relevant stuff
-                results.append({
-                    "id": item.get("id"),
-                    "trackName": item.get("trackName"),
-                    "artistName": item.get("artistName"),
-                    "albumName": item.get("albumName"),
-                    "duration": item.get("duration"),
-                    "syncedLyrics": item.get("syncedLyrics"),
-                    "plainLyrics": item.get("plainLyrics"),
-                    "isSynced": bool(item.get("syncedLyrics"))
-                })
-            return results
-        except requests.exceptions.RequestException as e:
+            body = response_cache().get(self.session, self.BASE_URL, params=params, ttl=LYRICS_TTL, timeout=10)
+            data = json.loads(body)
+            return [self._result(item) for item in data]
+        except (requests.exceptions.RequestException, ValueError) as e:
             print(f"Error fetching lyrics: {e}")
             return []
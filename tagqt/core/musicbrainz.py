@@ -1,10 +1,36 @@
-import musicbrainzngs
+import os
 import re
 import unicodedata
 import time
 
-musicbrainzngs.set_useragent("TagQt", "1.0", "https://github.com/example/tagqt")
-musicbrainzngs.set_rate_limit(limit_or_interval=1.0, new_requests=1)
+_musicbrainzngs = None
+_entities = None
+
+# Releases, release groups and artists by MBID change rarely; searches expire
+# sooner so newly added releases are found
+ENTITY_TTL = 30 * 24 * 3600
+SEARCH_TTL = 7 * 24 * 3600
+ENTITY_CACHE_BYTES = 32 * 1024 * 1024
+
+
+def _mb():
+    """Imports and configures musicbrainzngs on first use, keeping it out of startup."""
+    global _musicbrainzngs
+    if _musicbrainzngs is None:
+        import musicbrainzngs
+        musicbrainzngs.set_useragent("TagQt", "1.0", "https://github.com/example/tagqt")
+        musicbrainzngs.set_rate_limit(limit_or_interval=1.0, new_requests=1)
+        _musicbrainzngs = musicbrainzngs
+    return _musicbrainzngs
+
+
+def _entity_cache():
+    """MusicBrainz responses kept on disk across sessions, see MusicBrainzClient._cached."""
+    global _entities
+    if _entities is None:
+        from tagqt.core.cache import JsonCache, CACHE_DIR
+        _entities = JsonCache(os.path.join(CACHE_DIR, "musicbrainz"), ENTITY_CACHE_BYTES)
+    return _entities
 
 class MusicBrainzClient:
     @staticmethod
@@ -38,16 +64,35 @@ class MusicBrainzClient:
         for attempt in range(max_retries):
             try:
                 return func()
-            except (musicbrainzngs.NetworkError, requests.exceptions.RequestException, OSError) as e:
+            except (_mb().NetworkError, requests.exceptions.RequestException, OSError) as e:
                 if attempt < max_retries - 1:
                     time.sleep(2 ** attempt)
                     continue
                 print(f"MusicBrainz network error after {max_retries} retries: {e}")
                 return None
-            except musicbrainzngs.MusicBrainzError as e:
+            except _mb().MusicBrainzError as e:
                 print(f"MusicBrainz API error: {e}")
                 return None
         return None
+
+    @classmethod
+    def _cached(cls, name, ttl, func):
+        """func's response from the entity cache, or fetched through _retry and stored.
+
+        Failed requests are not stored, so they are tried again next time.
+        """
+        cache = _entity_cache()
+        data = cache.get(name, ttl)
+        if data is None:
+            data = cls._retry(func)
+            if data:
+                cache.put(name, data)
+        return data
+
+    @staticmethod
+    def _query_name(kind, *terms):
+        # Case and spacing do not change MusicBrainz search results
+        return kind + ":" + "\0".join(" ".join((term or "").casefold().split()) for term in terms)
     
     @classmethod
     def search_release(cls, artist, album, track_title=None):
@@ -55,13 +100,13 @@ class MusicBrainzClient:
             return None
         
         def do_search():
-            return musicbrainzngs.search_releases(
+            return _mb().search_releases(
                 artist=artist,
                 release=album,
                 limit=10
             )
         
-        data = cls._retry(do_search)
+        data = cls._cached(cls._query_name("search-release", artist, album), SEARCH_TTL, do_search)
         if not data:
             return None
             
@@ -118,20 +163,34 @@ class MusicBrainzClient:
     
     @classmethod
     def lookup_release(cls, release_id, track_title=None):
+        return cls.match_track(cls.fetch_release(release_id), track_title)
+
+    @classmethod
+    def fetch_release(cls, release_id):
+        """The release with its media and recordings, one request; match tracks with match_track."""
         if not release_id:
             return None
             
         def do_lookup():
-            return musicbrainzngs.get_release_by_id(
+            return _mb().get_release_by_id(
                 release_id,
                 includes=["recordings", "media", "tags", "release-groups"]
             )
         
-        data = cls._retry(do_lookup)
+        data = cls._cached(f"release:{release_id}", ENTITY_TTL, do_lookup)
         if not data:
             return None
-            
-        release = data.get("release", {})
+        return data.get("release", {})
+
+    @classmethod
+    def match_track(cls, release, track_title=None):
+        """Release details from fetch_release, with the position of track_title if it is on the release.
+
+        Works on the fetched data only, so every track of an album can be
+        matched against one download.
+        """
+        if release is None:
+            return None
         
         result = {
             "genres": [],
@@ -178,9 +237,9 @@ class MusicBrainzClient:
             return []
             
         def do_lookup():
-            return musicbrainzngs.get_release_group_by_id(rg_id, includes=["tags"])
+            return _mb().get_release_group_by_id(rg_id, includes=["tags"])
         
-        data = cls._retry(do_lookup)
+        data = cls._cached(f"release-group:{rg_id}", ENTITY_TTL, do_lookup)
         if not data:
             return []
             
@@ -197,9 +256,9 @@ class MusicBrainzClient:
             return []
             
         def do_lookup():
-            return musicbrainzngs.get_artist_by_id(artist_id, includes=["tags"])
+            return _mb().get_artist_by_id(artist_id, includes=["tags"])
         
-        data = cls._retry(do_lookup)
+        data = cls._cached(f"artist:{artist_id}", ENTITY_TTL, do_lookup)
         if not data:
             return []
             
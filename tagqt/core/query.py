@@ -0,0 +1,198 @@
+import os
+import re
+
+# Query field name -> field it filters, aliases included
+FIELD_ALIASES = {
+    'filename': 'filename', 'file': 'filename', 'name': 'filename',
+    'path': 'path',
+    'title': 'title',
+    'artist': 'artist',
+    'album': 'album',
+    'albumartist': 'album_artist', 'album_artist': 'album_artist',
+    'year': 'year', 'date': 'year',
+    'genre': 'genre',
+    'disc': 'disc_number', 'disk': 'disc_number', 'discnumber': 'disc_number',
+    'track': 'track_number', 'tracknumber': 'track_number',
+    'comment': 'comment',
+    'bpm': 'bpm',
+    'key': 'initial_key',
+    'bitrate': 'bitrate',
+    'samplerate': 'sample_rate',
+    'duration': 'duration', 'length': 'duration',
+    'size': 'filesize',
+    'format': 'format', 'ext': 'format',
+    'has': 'has',
+}
+
+# Fields read from the list columns of the store, by column index
+COLUMN_FIELDS = {'filename': 0, 'title': 1, 'artist': 2, 'album': 3, 'album_artist': 4,
+                 'year': 5, 'genre': 6, 'disc_number': 7, 'track_number': 8}
+# Fields compared as numbers; year, disc and track use their leading number ("1998-05-01", "3/12")
+NUMERIC_FIELDS = {'year', 'disc_number', 'track_number', 'bpm', 'bitrate', 'sample_rate', 'duration', 'filesize'}
+
+# Optional "-", optional "field:", then a quoted or bare value
+_TOKEN_RE = re.compile(r'\s*(-?)(?:([A-Za-z_]+):)?(?:"([^"]*)"?|(\S*))')
+_COMPARE_RE = re.compile(r'(>=|<=|>|<|=)?(.*)')
+_NUMBER_RE = re.compile(r'\s*(\d+(?:\.\d+)?)')
+
+
+class Query:
+    """A parsed filter query.
+
+    text: the free words, matched as one substring like the plain filter
+    terms: (field, negated, operator, value) tuples that must all hold
+    """
+
+    def __init__(self, text="", terms=()):
+        self.text = text
+        self.terms = tuple(terms)
+
+    def __bool__(self):
+        return bool(self.text or self.terms)
+
+    def compile(self, store):
+        """Returns a slot -> bool predicate over store for the terms, or None without terms.
+
+        The predicate reads the store's columns and records at call time, so
+        it stays valid as tracks are added or the store is cleared.
+        """
+        if not self.terms:
+            return None
+        checks = [_compile_term(store, *term) for term in self.terms]
+
+        def match(slot):
+            for check in checks:
+                if not check(slot):
+                    return False
+            return True
+        return match
+
+
+def parse_query(text):
+    """Parses filter text such as `artist:"boards of canada" year:>=1998 -has:cover format:flac`.
+
+    Supported forms are field:value (substring), field:=value (exact),
+    field:>=n, <=, >, <, field:a..b for numeric fields, has:cover or
+    has:<field>, and a leading "-" to negate any term. Words that are not a
+    valid term, e.g. an unknown field, are kept as free text.
+    """
+    text = text.lower()
+    words = []
+    terms = []
+    pos = 0
+    while pos < len(text):
+        m = _TOKEN_RE.match(text, pos)
+        if m.end() == pos:
+            break
+        pos = m.end()
+        negated, field, quoted, bare = m.groups()
+        value = quoted if quoted is not None else bare
+        raw = m.group(0).strip()
+        if not raw:
+            continue
+        term = _parse_term(field, value) if field else None
+        if term is not None:
+            terms.append((term[0], bool(negated), term[1], term[2]))
+        elif not field and negated and value:
+            # -word leaves out tracks containing word
+            terms.append(('text', True, '', value))
+        else:
+            words.append(raw if field or quoted is None else value)
+    return Query(" ".join(words).strip(), terms)
+
+
+def _parse_term(name, value):
+    """Returns (field, operator, value) or None when name:value is not a valid term."""
+    field = FIELD_ALIASES.get(name)
+    if field is None or not value:
+        return None
+    if field == 'has':
+        has = FIELD_ALIASES.get(value, value)
+        if has != 'cover' and has not in COLUMN_FIELDS and has not in NUMERIC_FIELDS and has != 'comment':
+            return None
+        return ('has', '', has)
+    op, operand = _COMPARE_RE.match(value).groups()
+    if not operand:
+        return None
+    if field not in NUMERIC_FIELDS:
+        if op and op != '=':
+            return None
+        return (field, op or '', operand)
+    if not op and '..' in operand:
+        low, _, high = operand.partition('..')
+        low, high = _parse_number(field, low), _parse_number(field, high)
+        if low is None or high is None:
+            return None
+        return (field, '..', (low, high))
+    number = _parse_number(field, operand)
+    if number is None:
+        return None
+    return (field, op or '=', number)
+
+
+def _parse_number(field, value):
+    if field == 'duration' and ':' in value:
+        minutes, _, seconds = value.partition(':')
+        if minutes.isdigit() and seconds.isdigit():
+            return int(minutes) * 60 + int(seconds)
+        return None
+    return _number(value)
+
+
+def _number(value):
+    m = _NUMBER_RE.match(str(value)) if value not in (None, "") else None
+    return float(m.group(1)) if m else None
+
+
+def _getter(store, field):
+    """slot -> raw value of field."""
+    if field in COLUMN_FIELDS:
+        column = COLUMN_FIELDS[field]
+        return lambda slot: store.columns[column][slot]
+    if field == 'path':
+        return lambda slot: store.paths[slot]
+    if field == 'format':
+        return lambda slot: os.path.splitext(store.paths[slot])[1][1:]
+    if field == 'text':
+        # Filename, title, artist and album, already lowercased
+        return lambda slot: store.search_index.texts[slot]
+    # Record attributes, all filled in by the scan; nothing here reads the file
+    return lambda slot: getattr(store.records[slot], field)
+
+
+def _compile_term(store, field, negated, op, value):
+    if field == 'has':
+        if value == 'cover':
+            check = lambda slot: store.records[slot].has_cover
+        else:
+            get = _getter(store, value)
+            check = lambda slot: bool(get(slot))
+    elif field in NUMERIC_FIELDS:
+        get = _getter(store, field)
+        if op == '..':
+            low, high = value
+            test = lambda n: low <= n <= high
+        else:
+            test = {
+                '=': lambda n: n == value,
+                '>=': lambda n: n >= value,
+                '<=': lambda n: n <= value,
+                '>': lambda n: n > value,
+                '<': lambda n: n < value,
+            }[op]
+
+        def check(slot):
+            number = _number(get(slot))
+            return number is not None and test(number)
+    elif field == 'format':
+        get = _getter(store, field)
+        check = lambda slot: get(slot).lower() == value
+    else:
+        get = _getter(store, field)
+        if op == '=':
+            check = lambda slot: str(get(slot) or "").lower() == value
+        else:
+            check = lambda slot: value in str(get(slot) or "").lower()
+    if negated:
+        return lambda slot: not check(slot)
+    return check
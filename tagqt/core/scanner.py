@@ -0,0 +1,118 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+AUDIO_EXTENSIONS = ('.mp3', '.flac', '.ogg', '.m4a', '.wav')
+
+
+def _scan_dir(path):
+    """Lists one directory, returning its audio files with their stat and its subdirectories."""
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        # Follows symlinks, loops are caught by the caller
+                        st = entry.stat()
+                        if not st.st_ino:
+                            # Windows leaves the cached inode empty
+                            st = os.stat(entry.path)
+                        subdirs.append((entry.path, (st.st_dev, st.st_ino)))
+                    elif entry.name.lower().endswith(AUDIO_EXTENSIONS) and entry.is_file():
+                        files.append((entry.path, entry.stat()))
+                except OSError:
+                    # Broken symlink or entry removed while scanning
+                    continue
+    except OSError:
+        # Unreadable directory, os.walk skips these too
+        pass
+    return files, subdirs
+
+
+def scan_audio_files(root, stop_event, max_workers=8):
+    """Yields (path, stat_result) for every audio file under root as it is found.
+
+    Directories are listed concurrently on a bounded thread pool, which hides
+    per-directory latency on network mounts. Directory symlinks are followed,
+    and each real directory (device, inode) is visited only once, so symlink
+    loops end instead of recursing forever.
+    """
+    try:
+        st = os.stat(root)
+    except OSError:
+        return
+    visited = {(st.st_dev, st.st_ino)}
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        pending = {executor.submit(_scan_dir, root)}
+        while pending:
+            done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            if stop_event.is_set():
+                return
+            for future in done:
+                files, subdirs = future.result()
+                for path, dir_id in subdirs:
+                    if dir_id not in visited:
+                        visited.add(dir_id)
+                        pending.add(executor.submit(_scan_dir, path))
+                yield from files
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def scan_audio_roots(roots, stop_event, max_workers=8):
+    """Yields (root, path, stat_result) for every audio file under several roots.
+
+    Each root is walked by scan_audio_files() on its own thread, so separate
+    disks are listed at the same time instead of one after the other.
+    """
+    if len(roots) == 1:
+        for path, st in scan_audio_files(roots[0], stop_event, max_workers):
+            yield roots[0], path, st
+        return
+
+    import queue
+    import threading
+
+    results = queue.Queue(maxsize=10000)
+    done = object()
+    # Set when the consumer goes away, so walkers blocked on a full queue give up
+    closed = threading.Event()
+
+    def put(item):
+        while not closed.is_set():
+            try:
+                results.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def walk(root):
+        try:
+            for path, st in scan_audio_files(root, stop_event, max_workers):
+                if not put((root, path, st)):
+                    return
+        finally:
+            put(done)
+
+    for root in roots:
+        threading.Thread(target=walk, args=(root,), name="RootScanner", daemon=True).start()
+
+    try:
+        remaining = len(roots)
+        while remaining:
+            try:
+                item = results.get(timeout=0.2)
+            except queue.Empty:
+                if stop_event.is_set():
+                    return
+                continue
+            if item is done:
+                remaining -= 1
+            else:
+                yield item
+    finally:
+        closed.set()
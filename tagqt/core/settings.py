@@ -1,3 +1,4 @@
+import os
 from PySide6.QtCore import QSettings
 
 
@@ -23,6 +24,16 @@ class Settings:
     def clear_recent_folders(self):
         self.settings.setValue("recent_folders", [])
     
+    def get_library_roots(self):
+        """Folders of the last library session, reopened together."""
+        roots = self.settings.value("library_roots", [])
+        if isinstance(roots, str):
+            return [roots] if roots else []
+        return roots or []
+    
+    def set_library_roots(self, roots):
+        self.settings.setValue("library_roots", list(roots))
+    
     def get_light_theme(self):
         return self.settings.value("light_theme", False, type=bool)
     
@@ -38,3 +49,17 @@ class Settings:
     def set_hidden_columns(self, columns):
         self.settings.setValue("hidden_columns", columns)
 
+    
+    def get_scan_workers(self):
+        """Number of processes used to parse tags when loading a folder (0 = one per CPU core)."""
+        workers = self.settings.value("scan_workers", 0, type=int)
+        return workers if workers > 0 else (os.cpu_count() or 1)
+    
+    def set_scan_workers(self, workers):
+        self.settings.setValue("scan_workers", workers)
+    
+    def get_watch_folders(self):
+        return self.settings.value("watch_folders", True, type=bool)
+    
+    def set_watch_folders(self, enabled):
+        self.settings.setValue("watch_folders", enabled)
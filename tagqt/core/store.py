@@ -0,0 +1,240 @@
+import bisect
+import itertools
+import os
+import re
+import unicodedata
+
+# Columns shown in the file list, in display order
+LIST_COLUMNS = ['filename', 'title', 'artist', 'album', 'album_artist', 'year', 'genre',
+                'disc_number', 'track_number', 'cover']
+
+
+def cover_text(record):
+    # Comes from the scan, no cover bytes are read
+    if not record.has_cover:
+        return ""
+    if record.cover_width and record.cover_height:
+        return f"{record.cover_width}x{record.cover_height}"
+    return "Yes"
+
+
+def column_values(path, record):
+    """Display strings of one track, in LIST_COLUMNS order."""
+    return [
+        os.path.basename(path),
+        record.title or "",
+        record.artist or "",
+        record.album or "",
+        record.album_artist or "",
+        record.year or "",
+        record.genre or "",
+        record.disc_number or "",
+        record.track_number or "",
+        cover_text(record),
+    ]
+
+
+_DIGITS_RE = re.compile(r'\d+')
+_RESOLUTION_RE = re.compile(r'(\d+)x(\d+)$')
+# Sorts after any text, so empty values go last
+_LAST = chr(0x10FFFF)
+_NO_COVER = 1 << 63
+
+
+def _number_part(m):
+    # Shorter numbers first, then digit by digit: "\x01" sorts before any text
+    digits = m.group().lstrip('0') or '0'
+    return '\x01' + chr(len(digits) + 1) + digits
+
+
+def natural_key(text):
+    """Case and accent folded text in which runs of digits compare as numbers.
+
+    "Track 2" sorts before "track 10", "3/12" before "10" and "Émile" next
+    to "emile". The key is a plain string, so sorting by it never calls
+    back into Python.
+    """
+    if not text:
+        return _LAST
+    text = text.casefold()
+    if not text.isascii():
+        text = "".join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    return _DIGITS_RE.sub(_number_part, text)
+
+
+def _cover_sort_key(value):
+    # By pixel count, covers of unknown size after sized ones, no cover last
+    m = _RESOLUTION_RE.match(value)
+    if m is not None:
+        return int(m.group(1)) * int(m.group(2))
+    return 1 << 62 if value else _NO_COVER
+
+
+# List column -> function of its display string returning the key the column sorts by;
+# year, disc and track numbers come out in numeric order from natural_key too
+SORT_KEYS = {column: natural_key for column in LIST_COLUMNS}
+SORT_KEYS['cover'] = _cover_sort_key
+# Keys of empty values, which stay last in a descending sort too
+EMPTY_SORT_KEYS = frozenset([_LAST, _NO_COVER])
+
+
+# Columns the search box matches against: filename, title, artist, album
+SEARCH_COLUMNS = 4
+
+
+class SearchIndex:
+    """Lowercased search text per slot, searched as one string.
+
+    The texts are joined into a single corpus with the start offset of every
+    slot, so a query is found by str.find jumping from hit to hit instead of
+    a Python level test per track. Queries matching most of the library are
+    cheaper as a plain scan, corpus.count() tells which case applies.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.texts = []
+        self._corpus = None # rebuilt on the first search after a change
+        self._starts = []
+
+    def set(self, slot, values):
+        text = "\n".join(values).lower()
+        if slot == len(self.texts):
+            self.texts.append(text)
+        else:
+            self.texts[slot] = text
+        self._corpus = None
+
+    def remove(self, slot):
+        self.texts[slot] = None
+        self._corpus = None
+
+    def search(self, query, within=None):
+        """Returns the ascending slots whose text contains query.
+
+        within: the result of an earlier query that query contains; a longer
+        query can only narrow it, so only those slots are checked.
+        """
+        texts = self.texts
+        if within is not None:
+            return [slot for slot in within if texts[slot] is not None and query in texts[slot]]
+        corpus = self._build()
+        if corpus.count(query) * 4 > len(texts):
+            return [slot for slot, text in enumerate(texts) if text is not None and query in text]
+        starts = self._starts
+        last = len(starts) - 1
+        slots = []
+        pos = corpus.find(query)
+        while pos != -1:
+            slot = bisect.bisect_right(starts, pos) - 1
+            slots.append(slot)
+            if slot == last:
+                break
+            # Further hits in the same track are skipped
+            pos = corpus.find(query, starts[slot + 1])
+        return slots
+
+    def _build(self):
+        if self._corpus is None:
+            # NUL keeps a query from matching across two tracks, removed slots are empty
+            texts = [text or "" for text in self.texts]
+            self._corpus = "\0".join(texts)
+            self._starts = list(itertools.accumulate((len(text) + 1 for text in texts[:-1]), initial=0))
+        return self._corpus
+
+
+class TrackStore:
+    """The loaded tracks, with their list columns stored column by column.
+
+    Every track gets a slot that never moves, so views can use slots as row
+    ids and only render the rows on screen. Removed slots are left empty
+    instead of shifting the columns; path lookups go through slot_of.
+
+    Sort keys of a column are computed the first time the list is sorted by
+    it, then kept up to date as tracks are added or updated.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.paths = []
+        self.records = []
+        self.columns = [[] for _ in LIST_COLUMNS]
+        self.slot_of = {}
+        self.search_index = SearchIndex()
+        self._sort_keys = {} # column index -> sort key per slot
+
+    def __len__(self):
+        return len(self.slot_of)
+
+    def __contains__(self, path):
+        return path in self.slot_of
+
+    def add(self, path, record):
+        """Stores a track and returns its slot; a path already present is updated in place."""
+        slot = self.slot_of.get(path)
+        if slot is not None:
+            self.update(slot, record)
+            return slot
+        slot = len(self.paths)
+        self.paths.append(path)
+        self.records.append(record)
+        values = column_values(path, record)
+        for column, value in zip(self.columns, values):
+            column.append(value)
+        for column, keys in self._sort_keys.items():
+            keys.append(SORT_KEYS[LIST_COLUMNS[column]](values[column]))
+        self.search_index.set(slot, values[:SEARCH_COLUMNS])
+        self.slot_of[path] = slot
+        return slot
+
+    def update(self, slot, record):
+        self.records[slot] = record
+        values = column_values(self.paths[slot], record)
+        for column, value in zip(self.columns, values):
+            column[slot] = value
+        for column, keys in self._sort_keys.items():
+            keys[slot] = SORT_KEYS[LIST_COLUMNS[column]](values[column])
+        self.search_index.set(slot, values[:SEARCH_COLUMNS])
+
+    def rename(self, old_path, new_path, record):
+        slot = self.slot_of.pop(old_path, None)
+        if slot is None:
+            return None
+        self.paths[slot] = new_path
+        self.slot_of[new_path] = slot
+        self.update(slot, record)
+        return slot
+
+    def remove(self, path):
+        """Empties the slot of path and returns it, or None if path is not stored."""
+        slot = self.slot_of.pop(path, None)
+        if slot is not None:
+            self.paths[slot] = None
+            self.records[slot] = None
+            self.search_index.remove(slot)
+        return slot
+
+    def sort_keys(self, column):
+        """The sort key of every slot for a list column, indexed by slot."""
+        keys = self._sort_keys.get(column)
+        if keys is None:
+            make = SORT_KEYS[LIST_COLUMNS[column]]
+            keys = [None if path is None else make(value) for path, value in zip(self.paths, self.columns[column])]
+            self._sort_keys[column] = keys
+        return keys
+
+    def get(self, path):
+        slot = self.slot_of.get(path)
+        return None if slot is None else self.records[slot]
+
+    def slots(self):
+        """Live slots in the order their tracks were added."""
+        return [slot for slot, path in enumerate(self.paths) if path is not None]
+
+    def items(self):
+        """(path, TrackRecord) pairs in the order they were added."""
+        return [(path, record) for path, record in zip(self.paths, self.records) if path is not None]
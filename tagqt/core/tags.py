@@ -5,7 +5,6 @@ from mutagen.flac import FLAC, Picture
 from mutagen.oggvorbis import OggVorbis
 from mutagen.mp4 import MP4, MP4Cover
 import os
-from PIL import Image
 import io
 
 class MetadataHandler:
@@ -379,6 +378,7 @@ class MetadataHandler:
         # Resize if needed
         if max_size and max_size > 0:
             try:
+                from PIL import Image
                 img = Image.open(io.BytesIO(data))
                 
                 if img.width > max_size or img.height > max_size:
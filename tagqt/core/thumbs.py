@@ -0,0 +1,19 @@
+import os
+from tagqt.core.cache import DiskCache
+
+THUMBNAIL_DIR = os.path.expanduser("~/.config/TagQt/thumbnails")
+
+
+class ThumbnailCache(DiskCache):
+    """Rendered cover thumbnails on disk, least recently used evicted past max_bytes.
+
+    Entries are keyed by the file's identity (see library.file_key), so an
+    edited file simply misses and its old entry ages out.
+    """
+
+    def __init__(self, cache_dir=THUMBNAIL_DIR, max_bytes=64 * 1024 * 1024):
+        super().__init__(cache_dir, max_bytes)
+
+    @classmethod
+    def key(cls, path, file_key, size):
+        return cls.digest(f"{path}\0{file_key}\0{size}")
@@ -0,0 +1,257 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+from tagqt.core.scanner import AUDIO_EXTENSIONS
+
+# inotify(7) event masks
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+
+WATCH_MASK = (IN_CLOSE_WRITE | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+              IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None and sys.platform.startswith('linux'):
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            libc.inotify_init1
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+            _libc = libc
+        except (OSError, AttributeError):
+            _libc = False
+    return _libc or None
+
+
+def is_available():
+    """inotify is Linux only, elsewhere folders are not watched."""
+    return _load_libc() is not None
+
+
+class FolderWatcher:
+    """Watches a folder tree with inotify and reports audio file changes in batches.
+
+    The watches are added from the background thread too, so start() does
+    not walk the tree; directory symlinks are followed like the scanner
+    does, each real directory (device, inode) watched once. Problems such as
+    running out of inotify watches go to on_error(message).
+    Events are collected on that thread and coalesced per path. Once
+    the tree has been quiet for QUIET_PERIOD seconds (or MAX_DELAY seconds
+    have passed) on_changes(changed_files, removed_files, removed_dirs) is
+    called once for the whole batch, from the watcher thread, so copying an
+    album in produces a single update.
+    If the kernel queue overflows on_overflow() is called instead, since
+    events were lost and only a rescan can tell what changed.
+    """
+    QUIET_PERIOD = 0.5
+    MAX_DELAY = 5.0
+
+    def __init__(self, root, on_changes, on_overflow=None, on_error=None):
+        self.root = os.path.abspath(root)
+        self.on_changes = on_changes
+        self.on_overflow = on_overflow
+        self.on_error = on_error
+        self._libc = _load_libc()
+        self._fd = -1
+        self._wd_to_dir = {}
+        self._dir_to_wd = {}
+        self._dir_ids = {} # watched directory -> (device, inode) of what it resolves to
+        self._watched_ids = set()
+        self._changed = set()
+        self._removed = set()
+        self._removed_dirs = set()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if not self._libc:
+            raise OSError("inotify is not available on this platform")
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._thread = threading.Thread(target=self._run, name="FolderWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            # The thread closes the inotify descriptor on its way out
+            self._thread.join(1.0)
+            self._thread = None
+
+    def _error(self, message):
+        if self.on_error:
+            self.on_error(message)
+        else:
+            print(message)
+
+    def _add_watch(self, path):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            if errno == 28: # ENOSPC
+                self._error(f"Not watching {path} and below: fs.inotify.max_user_watches is exhausted")
+            else:
+                self._error(f"Not watching {path}: {os.strerror(errno)}")
+            return False
+        self._wd_to_dir[wd] = path
+        self._dir_to_wd[path] = wd
+        return True
+
+    def _watch_tree(self, top):
+        """Adds watches for top and every directory below it, returning the audio files found."""
+        files = []
+        for dirpath, dirs, filenames in os.walk(top, followlinks=True):
+            if self._stop_event.is_set():
+                break
+            try:
+                st = os.stat(dirpath)
+            except OSError:
+                dirs[:] = []
+                continue
+            dir_id = (st.st_dev, st.st_ino)
+            # A second path to a watched directory (symlink, or a loop back up) is not descended
+            if dir_id in self._watched_ids or not self._add_watch(dirpath):
+                dirs[:] = []
+                continue
+            self._dir_ids[dirpath] = dir_id
+            self._watched_ids.add(dir_id)
+            files.extend(os.path.join(dirpath, f) for f in filenames
+                         if f.lower().endswith(AUDIO_EXTENSIONS))
+        return files
+
+    def _unwatch_tree(self, top):
+        prefix = os.path.join(top, "")
+        for path in [p for p in self._dir_to_wd if p == top or p.startswith(prefix)]:
+            wd = self._dir_to_wd.pop(path)
+            self._wd_to_dir.pop(wd, None)
+            self._forget_dir(path)
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def _forget_dir(self, path):
+        self._watched_ids.discard(self._dir_ids.pop(path, None))
+
+    def _run(self):
+        try:
+            self._watch_tree(self.root)
+            self._watch_events()
+        finally:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _watch_events(self):
+        first_event = None
+        last_event = None
+        while not self._stop_event.is_set():
+            ready, _, _ = select.select([self._fd], [], [], 0.2)
+            if ready:
+                try:
+                    data = os.read(self._fd, 64 * 1024)
+                except BlockingIOError:
+                    data = b""
+                except OSError:
+                    break
+                if data:
+                    now = time.monotonic()
+                    first_event = first_event or now
+                    last_event = now
+                    self._handle_events(data)
+
+            if first_event is None:
+                continue
+            now = time.monotonic()
+            if now - last_event >= self.QUIET_PERIOD or now - first_event >= self.MAX_DELAY:
+                first_event = last_event = None
+                self._flush()
+
+    def _handle_events(self, data):
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                self._changed.clear()
+                self._removed.clear()
+                self._removed_dirs.clear()
+                if self.on_overflow:
+                    self.on_overflow()
+                continue
+
+            directory = self._wd_to_dir.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                self._wd_to_dir.pop(wd, None)
+                self._dir_to_wd.pop(directory, None)
+                self._forget_dir(directory)
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                # Handled through the parent's delete/move event, except for the root itself
+                if directory == self.root:
+                    self._removed_dirs.add(directory)
+                continue
+
+            path = os.path.join(directory, os.fsdecode(name))
+            if not mask & IN_ISDIR and not path.lower().endswith(AUDIO_EXTENSIONS):
+                # Symlinks to directories are followed like the scan does
+                if mask & (IN_CREATE | IN_MOVED_TO) and os.path.isdir(path):
+                    self._removed_dirs.discard(path)
+                    self._changed.update(self._watch_tree(path))
+                elif mask & (IN_DELETE | IN_MOVED_FROM) and path in self._dir_to_wd:
+                    self._unwatch_tree(path)
+                    self._removed_dirs.add(path)
+            elif mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._removed_dirs.discard(path)
+                    self._changed.update(self._watch_tree(path))
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    self._unwatch_tree(path)
+                    self._removed_dirs.add(path)
+            elif path.lower().endswith(AUDIO_EXTENSIONS):
+                if mask & (IN_DELETE | IN_MOVED_FROM):
+                    self._changed.discard(path)
+                    self._removed.add(path)
+                elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO | IN_ATTRIB):
+                    # IN_CREATE alone is skipped, the file is read once IN_CLOSE_WRITE says it is complete
+                    self._removed.discard(path)
+                    self._changed.add(path)
+
+    def _flush(self):
+        changed = [p for p in self._changed if os.path.isfile(p)]
+        removed = set(self._removed) | (self._changed - set(changed))
+        removed_dirs = list(self._removed_dirs)
+        self._changed.clear()
+        self._removed.clear()
+        self._removed_dirs.clear()
+        if changed or removed or removed_dirs:
+            try:
+                self.on_changes(changed, list(removed), removed_dirs)
+            except Exception as e:
+                print(f"Error handling folder changes: {e}")
@@ -0,0 +1,110 @@
+import hashlib
+import os
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+from tagqt.core.cache import CACHE_DIR, DiskCache, JsonCache
+
+# Seconds a response is used without asking the server again, per endpoint
+LYRICS_TTL = 7 * 24 * 3600
+MUSICBRAINZ_TTL = 7 * 24 * 3600
+SEARCH_TTL = 24 * 3600 # iTunes, whose results change the most
+IMAGE_TTL = 30 * 24 * 3600
+# Requests sent to one server at the same time, whatever the number of threads asking
+MAX_PER_HOST = 4
+
+_responses = None
+
+
+def response_cache():
+    """The ResponseCache shared by the lyrics and cover art lookups."""
+    global _responses
+    if _responses is None:
+        _responses = ResponseCache()
+    return _responses
+
+
+class ResponseCache:
+    """GET responses on disk, reused for ttl seconds and then revalidated.
+
+    Each request, by URL and parameters, keeps a small entry with the
+    validators the server sent. Bodies are stored by the hash of their
+    content, so an image reached through several URLs is stored once. Past
+    its ttl a response is revalidated with If-None-Match/If-Modified-Since
+    and a 304 reuses the stored body. Entries and bodies are evicted least
+    recently used beyond max_bytes.
+
+    Safe to use from several threads; at most max_per_host requests go to
+    one server at a time, the others wait for a free slot.
+    """
+
+    def __init__(self, cache_dir=os.path.join(CACHE_DIR, "http"), max_bytes=256 * 1024 * 1024,
+                 max_per_host=MAX_PER_HOST):
+        self.entries = JsonCache(os.path.join(cache_dir, "entries"), max_bytes // 32)
+        self.bodies = DiskCache(os.path.join(cache_dir, "bodies"), max_bytes)
+        self.max_per_host = max_per_host
+        self._hosts = {} # host -> semaphore limiting its concurrent requests
+        self._lock = threading.Lock()
+
+    def _host_slots(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            slots = self._hosts.get(host)
+            if slots is None:
+                slots = self._hosts[host] = threading.BoundedSemaphore(self.max_per_host)
+        return slots
+
+    @staticmethod
+    def _name(url, params):
+        if not params:
+            return url
+        return f"{url}?{urlencode(sorted(params.items()))}"
+
+    def get(self, session, url, params=None, headers=None, ttl=SEARCH_TTL, timeout=10, keep_not_found=False):
+        """The body of GET url, from the cache when fresh enough.
+
+        session: requests or a requests.Session. Raises what the request
+        raises, including HTTPError for error statuses, unless an expired
+        copy of the response is stored; that copy is returned instead.
+        keep_not_found: a 404 returns None and is cached like a response.
+        """
+        import requests
+        name = self._name(url, params)
+        entry = self.entries.entry(name)
+        fresh = entry is not None and time.time() - entry['time'] <= ttl
+        if fresh and keep_not_found and entry.get('status') == 404:
+            return None
+        body = self.bodies.get(entry['body']) if entry and entry.get('body') else None
+        if body is not None and fresh:
+            return body
+
+        headers = dict(headers or {})
+        if body is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        try:
+            with self._host_slots(url):
+                response = session.get(url, params=params, headers=headers, timeout=timeout)
+            if response.status_code == 304 and body is not None:
+                # Still current, only the entry's time is renewed
+                self.entries.put(name, None, body=entry['body'], etag=entry.get('etag'),
+                                 last_modified=entry.get('last_modified'))
+                return body
+            if keep_not_found and response.status_code == 404:
+                self.entries.put(name, None, status=404)
+                return None
+            response.raise_for_status()
+        except requests.exceptions.RequestException:
+            if body is not None:
+                return body
+            raise
+
+        content = response.content
+        digest = hashlib.sha256(content).hexdigest()
+        if digest not in self.bodies:
+            self.bodies.put(digest, content)
+        self.entries.put(name, None, body=digest, etag=response.headers.get('ETag'),
+                         last_modified=response.headers.get('Last-Modified'))
+        return content
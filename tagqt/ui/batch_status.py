@@ -1,10 +1,24 @@
 from PySide6.QtWidgets import (
-    QDialog, QVBoxLayout, QTreeWidget, QTreeWidgetItem, 
+    QDialog, QVBoxLayout, QHBoxLayout, QTreeView, QComboBox,
     QPushButton, QHeaderView, QProgressBar, QLabel, 
     QDialogButtonBox, QWidget
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QTimer, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from PySide6.QtGui import QColor
 from tagqt.ui.theme import Theme
+from tagqt.ui.roles import DISPLAY_ROLE, TOOLTIP_ROLE, FOREGROUND_ROLE
+import os
+
+# Result status -> category used for the counts, colors and the status filter
+STATUS_CATEGORIES = {
+    'Success': 'success', 'Updated': 'success', 'Found': 'success', 'Renamed': 'success', 'Exported': 'success',
+    'Skipped': 'skipped',
+    'Error': 'error', 'Missing': 'error', 'Failed': 'error',
+}
+CATEGORY_LABELS = [('success', "Succeeded"), ('skipped', "Skipped"), ('error', "Failed"), ('other', "Other")]
+CATEGORY_ROLE = Qt.UserRole + 1
+# Results are shown in batches this often instead of one by one
+FLUSH_INTERVAL_MS = 100
 
 class ClickableProgressBar(QProgressBar):
     clicked = Signal()
@@ -20,6 +34,89 @@ class ClickableLabel(QLabel):
         self.clicked.emit()
         super().mousePressEvent(event)
 
+class BatchResultModel(QAbstractTableModel):
+    """Results keyed by full path, one row per file in the order first reported."""
+
+    def __init__(self):
+        super().__init__()
+        self.headers = ["File", "Status", "Details"]
+        self.colors = {
+            'success': QColor("#4ade80"),
+            'skipped': QColor(Theme.SUBTEXT0),
+            'error': QColor(Theme.RED),
+            'other': QColor(Theme.SUBTEXT0),
+        }
+        self.clear()
+
+    def clear(self):
+        self.beginResetModel()
+        self.paths = []
+        self.statuses = []
+        self.details = []
+        self.row_of = {}
+        self.counts = {category: 0 for category, _ in CATEGORY_LABELS}
+        self.endResetModel()
+
+    def apply(self, results):
+        """results: {path: (status, details)}; updates known paths in place and appends new ones."""
+        new = []
+        changed = []
+        for path, (status, details) in results.items():
+            row = self.row_of.get(path)
+            if row is None:
+                new.append((path, status, details))
+                continue
+            self.counts[STATUS_CATEGORIES.get(self.statuses[row], 'other')] -= 1
+            self.counts[STATUS_CATEGORIES.get(status, 'other')] += 1
+            self.statuses[row] = status
+            self.details[row] = details
+            changed.append(row)
+        if changed:
+            self.dataChanged.emit(self.index(min(changed), 0), self.index(max(changed), len(self.headers) - 1))
+        if new:
+            start = len(self.paths)
+            self.beginInsertRows(QModelIndex(), start, start + len(new) - 1)
+            for row, (path, status, details) in enumerate(new, start):
+                self.paths.append(path)
+                self.statuses.append(status)
+                self.details.append(details)
+                self.row_of[path] = row
+                self.counts[STATUS_CATEGORIES.get(status, 'other')] += 1
+            self.endInsertRows()
+
+    def results(self):
+        return [{'file': path, 'status': status, 'details': details}
+                for path, status, details in zip(self.paths, self.statuses, self.details)]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.paths)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.headers)
+
+    def data(self, index, role=DISPLAY_ROLE):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == CATEGORY_ROLE:
+            return STATUS_CATEGORIES.get(self.statuses[row], 'other')
+        if role == DISPLAY_ROLE:
+            if column == 0:
+                return os.path.basename(self.paths[row]) or self.paths[row]
+            return self.statuses[row] if column == 1 else self.details[row]
+        if role == TOOLTIP_ROLE and column == 0:
+            # Files in different folders can share a name
+            return self.paths[row]
+        if role == FOREGROUND_ROLE and column == 1:
+            return self.colors[STATUS_CATEGORIES.get(self.statuses[row], 'other')]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.headers[section]
+        return None
+
+
 class BatchStatusDialog(QDialog):
     def __init__(self, parent=None, title="Batch Operation"):
         super().__init__(parent)
@@ -55,11 +152,29 @@ class BatchStatusDialog(QDialog):
         """)
         layout.addWidget(self.progress_bar)
         
+        # Status filter, with the count of each status
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Show:"))
+        self.status_filter = QComboBox()
+        self.status_filter.addItem("All", "")
+        for category, label in CATEGORY_LABELS:
+            self.status_filter.addItem(label, category)
+        self.status_filter.currentIndexChanged.connect(self._on_filter_changed)
+        filter_layout.addWidget(self.status_filter)
+        filter_layout.addStretch()
+        layout.addLayout(filter_layout)
+        
         # Results Tree (Matching UnifiedSearchDialog style)
-        self.tree = QTreeWidget()
-        self.tree.setHeaderLabels(["File", "Status", "Details"])
+        self.model = BatchResultModel()
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setFilterRole(CATEGORY_ROLE)
+        self.proxy.setFilterKeyColumn(1)
+        
+        self.tree = QTreeView()
+        self.tree.setModel(self.proxy)
         
-        self.tree.header().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.tree.header().setSectionResizeMode(QHeaderView.Interactive)
         self.tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
         self.tree.header().setSectionResizeMode(2, QHeaderView.Stretch)
         self.tree.setRootIsDecorated(False)
@@ -78,7 +193,22 @@ class BatchStatusDialog(QDialog):
         
         layout.addWidget(buttons)
         
-        self.results = [] 
+        self._pending = {} # path -> (status, details) not shown yet
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.timeout.connect(self.flush)
+        self._update_counts()
+
+    @property
+    def results(self):
+        self.flush()
+        return self.model.results()
+
+    @property
+    def counts(self):
+        """Number of files per status category ('success', 'skipped', 'error', 'other')."""
+        self.flush()
+        return dict(self.model.counts)
 
     def update_progress(self, current, total):
         self.progress_bar.setRange(0, total)
@@ -86,46 +216,38 @@ class BatchStatusDialog(QDialog):
         percent = int((current / total) * 100) if total > 0 else 0
         self.status_label.setText(f"Processing {current}/{total} ({percent}%)")
     def set_finished(self):
+        self.flush()
         self.status_label.setText("Operation Completed")
         self.progress_bar.setValue(self.progress_bar.maximum())
 
     def add_result(self, filepath, status, details):
-        import os
-        filename = os.path.basename(filepath)
-        
-        existing_item = None
-        for i in range(self.tree.topLevelItemCount()):
-            item = self.tree.topLevelItem(i)
-            if item.text(0) == filename:
-                existing_item = item
-                break
-        
-        if existing_item:
-            existing_item.setText(1, status)
-            existing_item.setText(2, details)
-            item = existing_item
-        else:
-            item = QTreeWidgetItem([filename, status, details])
-            self.tree.addTopLevelItem(item)
-        
-        from PySide6.QtGui import QColor
-        if status == "Success" or status == "Found" or status == "Updated":
-            item.setForeground(1, QColor("#4ade80"))
-        elif status == "Error" or status == "Missing":
-            item.setForeground(1, QColor(Theme.RED))
-        elif status == "Skipped":
-            item.setForeground(1, QColor(Theme.SUBTEXT0))
-        else:
-            item.setForeground(1, QColor(Theme.SUBTEXT0))
-        
-        for i, r in enumerate(self.results):
-            if r['file'] == filepath:
-                self.results[i] = {'file': filepath, 'status': status, 'details': details}
-                return
-        self.results.append({'file': filepath, 'status': status, 'details': details})
+        # A later result for the same file replaces the pending one
+        self._pending[filepath] = (status, details)
+        if not self.flush_timer.isActive():
+            self.flush_timer.start(FLUSH_INTERVAL_MS)
+
+    def flush(self):
+        """Shows the pending results now."""
+        self.flush_timer.stop()
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        self.model.apply(pending)
+        self._update_counts()
+
+    def _update_counts(self):
+        counts = self.model.counts
+        self.status_filter.setItemText(0, f"All ({sum(counts.values())})")
+        for i, (category, label) in enumerate(CATEGORY_LABELS, 1):
+            self.status_filter.setItemText(i, f"{label} ({counts[category]})")
+
+    def _on_filter_changed(self, index):
+        self.proxy.setFilterFixedString(self.status_filter.itemData(index))
 
     def clear(self):
-        self.tree.clear()
-        self.results = []
+        self.flush_timer.stop()
+        self._pending = {}
+        self.model.clear()
+        self._update_counts()
         self.progress_bar.setValue(0)
         self.status_label.setText("Ready")
@@ -0,0 +1,155 @@
+from PySide6.QtCore import Signal, Qt, QByteArray, QBuffer, QIODevice
+from PySide6.QtGui import QImage, QImageReader
+from collections import OrderedDict
+import hashlib
+import os
+from tagqt.core.library import file_key
+from tagqt.ui.loader import BackgroundLoader
+
+# Edge of the sidebar cover in pixels
+COVER_SIZE = 200
+
+
+class CoverLoader(BackgroundLoader):
+    """Reads and decodes sidebar covers on a background thread.
+
+    Covers are decoded straight to sidebar size, which lets the JPEG decoder
+    skip most of a large scan. Decoded images are kept in a small LRU keyed
+    by file, its identity (see library.file_key) and the cover location, so
+    a cover replaced in place misses, and by content too, so the other tracks of
+    an album sharing the same embedded picture are not decoded again. With a
+    ThumbnailCache the scaled image is also stored on disk for later
+    sessions.
+
+    request() answers from memory right away when it can, using the file
+    identity the loader thread last saw so the UI thread never stats; the
+    loader thread then checks the file and only sends a cover through loaded
+    if it differs from that answer, as a null image if there is none or it
+    could not be read.
+    """
+    loaded = Signal(str, QImage, str) # path, image at sidebar size, original resolution
+
+    def __init__(self, thumbnails=None, size=COVER_SIZE, memory_items=64):
+        super().__init__()
+        self.thumbnails = thumbnails
+        self.size = size
+        self.memory_items = memory_items
+        self._images = OrderedDict() # (path, file key, cover offset, cover size) -> (image, resolution)
+        self._file_keys = OrderedDict() # path -> file key when the loader thread last read it
+        self._answered = None # (path, (image, resolution)) request() last answered from memory
+        self._by_content = OrderedDict() # digest of the cover bytes -> (image, resolution)
+
+    @staticmethod
+    def _key(path, key, record):
+        if record is None:
+            return (path, key, None, None)
+        return (path, key, record.cover_offset, record.cover_size)
+
+    def _remember(self, cache, key, value):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.memory_items:
+            cache.popitem(last=False)
+
+    def cached(self, path, record, key):
+        """(image, resolution) if the cover is decoded already, else None."""
+        cache_key = self._key(path, key, record)
+        with self._lock:
+            hit = self._images.get(cache_key)
+            if hit is not None:
+                self._images.move_to_end(cache_key)
+            return hit
+
+    def request(self, path, record):
+        """Returns (image, resolution) from memory, or None and emits loaded once decoded."""
+        with self._lock:
+            key = self._file_keys.get(path)
+        hit = self.cached(path, record, key) if key is not None else None
+        with self._lock:
+            self._answered = (path, hit) if hit is not None else None
+        # Even after a hit, the file may have changed since it was last read
+        super().request(path, record)
+        return hit
+
+    def _load(self, path, record):
+        # Prefetched files are checked here rather than in _is_cached(), which must not stat with the lock held
+        key = file_key(os.stat(path))
+        with self._lock:
+            self._remember(self._file_keys, path, key)
+        # A prefetch may have decoded it since it was requested
+        result = self.cached(path, record, key)
+        if result is None:
+            result = self._read(path, record, key)
+            if result is not None:
+                with self._lock:
+                    self._remember(self._images, self._key(path, key, record), result)
+        return result
+
+    def _deliver(self, path, result):
+        with self._lock:
+            answered = self._answered
+        if answered is not None and answered[0] == path and answered[1] is result:
+            return # request() already showed this cover
+        if result is None:
+            result = (QImage(), "")
+        self.loaded.emit(path, *result)
+
+    def _read(self, path, record, key):
+        thumb_key = None
+        if self.thumbnails is not None:
+            thumb_key = self.thumbnails.key(path, key, self.size)
+            data = self.thumbnails.get(thumb_key)
+            if data:
+                resolution, _, image_data = data.partition(b"\n")
+                image = QImage.fromData(image_data)
+                if not image.isNull():
+                    return image, resolution.decode('ascii', 'replace')
+
+        if record is not None:
+            cover = record.read_cover()
+        else:
+            from tagqt.core.tags import MetadataHandler
+            cover = MetadataHandler(path).get_cover()
+        if not cover:
+            return None
+
+        digest = hashlib.blake2b(cover, digest_size=16).digest()
+        with self._lock:
+            result = self._by_content.get(digest)
+        if result is None:
+            result = self._decode(cover)
+            if result is None:
+                return None
+            with self._lock:
+                self._remember(self._by_content, digest, result)
+        if thumb_key is not None:
+            self.thumbnails.put(thumb_key, result[1].encode('ascii') + b"\n" + self._encode(result[0]))
+        return result
+
+    def _decode(self, data):
+        buffer = QBuffer()
+        buffer.setData(QByteArray(data))
+        buffer.open(QIODevice.ReadOnly)
+        reader = QImageReader(buffer)
+        reader.setAutoTransform(True)
+        original = reader.size()
+        if original.isValid() and (original.width() > self.size or original.height() > self.size):
+            reader.setScaledSize(original.scaled(self.size, self.size, Qt.KeepAspectRatio))
+        image = reader.read()
+        if image.isNull():
+            return None
+        if not original.isValid():
+            original = image.size()
+        return image, f"{original.width()}x{original.height()}"
+
+    @staticmethod
+    def _encode(image):
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.WriteOnly)
+        if image.hasAlphaChannel():
+            image.save(buffer, "PNG")
+        else:
+            image.save(buffer, "JPG", 90)
+        buffer.close()
+        return bytes(data)
@@ -0,0 +1,119 @@
+from PySide6.QtCore import QObject, Signal
+from collections import OrderedDict, deque
+import os
+import threading
+from tagqt.core.library import file_key
+
+
+class BackgroundLoader(QObject):
+    """Loads per-file data on a background thread for whatever is selected now.
+
+    Only the latest request is kept: requests replaced before the thread got
+    to them are dropped, and results for a file that is no longer current
+    are simply not used by the receiver. Prefetched files are loaded once
+    nothing is requested. Subclasses implement _load() and _deliver(),
+    which runs on the loader thread and emits a signal; a requested file
+    that could not be loaded is delivered with a result of None.
+    """
+
+    def __init__(self, prefetch_items=8):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._current = None # (path, record) wanted now
+        self._prefetch = deque(maxlen=prefetch_items)
+        self._thread = None
+
+    def request(self, path, record=None):
+        with self._lock:
+            self._current = (path, record)
+            self._start()
+            self._wake.notify()
+
+    def prefetch(self, items):
+        """Loads (path, record) pairs ahead of time, after the current request."""
+        with self._lock:
+            for path, record in items:
+                if not self._is_cached(path, record):
+                    self._prefetch.append((path, record))
+            if self._prefetch:
+                self._start()
+                self._wake.notify()
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while self._current is None and not self._prefetch:
+                    self._wake.wait()
+                if self._current is not None:
+                    (path, record), self._current = self._current, None
+                    prefetched = False
+                else:
+                    path, record = self._prefetch.popleft()
+                    prefetched = True
+                    if self._is_cached(path, record):
+                        continue
+            try:
+                result = self._load(path, record)
+            except Exception as e:
+                print(f"Error loading {path}: {e}")
+                result = None
+            if not prefetched:
+                self._deliver(path, result)
+
+    def _is_cached(self, path, record):
+        """Called with the lock held."""
+        return False
+
+    def _load(self, path, record):
+        raise NotImplementedError
+
+    def _deliver(self, path, result):
+        raise NotImplementedError
+
+
+class MetadataLoader(BackgroundLoader):
+    """Opens MetadataHandlers off the UI thread for the sidebar.
+
+    Handlers of recent and prefetched files are kept with the identity of
+    the file they were read from; a request only reuses one after checking
+    the file did not change, which costs a stat instead of a full parse.
+    """
+    loaded = Signal(str, object) # path, MetadataHandler or None if it could not be read
+
+    def __init__(self, memory_items=16):
+        super().__init__()
+        self.memory_items = memory_items
+        self._handlers = OrderedDict() # path -> (file key, MetadataHandler)
+
+    def forget(self, path):
+        """Drops the handler kept for path, e.g. once it is edited and saved."""
+        with self._lock:
+            self._handlers.pop(path, None)
+
+    def _is_cached(self, path, record):
+        return path in self._handlers
+
+    def _load(self, path, record):
+        key = file_key(os.stat(path))
+        with self._lock:
+            entry = self._handlers.get(path)
+            if entry is not None and entry[0] == key:
+                self._handlers.move_to_end(path)
+                return entry[1]
+        from tagqt.core.tags import MetadataHandler
+        handler = MetadataHandler(path)
+        with self._lock:
+            self._handlers[path] = (key, handler)
+            self._handlers.move_to_end(path)
+            while len(self._handlers) > self.memory_items:
+                self._handlers.popitem(last=False)
+        return handler
+
+    def _deliver(self, path, handler):
+        self.loaded.emit(path, handler)
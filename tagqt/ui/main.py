@@ -1,24 +1,23 @@
-from PySide6.QtWidgets import QMainWindow, QHBoxLayout, QVBoxLayout, QWidget, QPushButton, QFileDialog, QLabel, QComboBox, QMenuBar, QMenu, QTreeWidgetItemIterator, QDialog, QProgressBar, QSizePolicy, QLineEdit
+from PySide6.QtWidgets import QMainWindow, QHBoxLayout, QVBoxLayout, QWidget, QPushButton, QFileDialog, QLabel, QComboBox, QMenuBar, QMenu, QDialog, QProgressBar, QSizePolicy, QLineEdit
 from PySide6.QtGui import QPixmap, QAction, QShortcut, QKeySequence
 from PySide6.QtCore import Qt, QTimer, QThread, QEvent, QPropertyAnimation, QEasingCurve
 from tagqt.ui.theme import Theme
 from tagqt.ui.tracks import FileList
 from tagqt.ui.side import Sidebar
-from tagqt.core.tags import MetadataHandler
 from tagqt.core.lyric import LyricsFetcher
 from tagqt.core.roman import Romanizer
 from tagqt.core.art import CoverArtManager
 from tagqt.core.case import CaseConverter
 from tagqt.core.rename import Renamer
 from tagqt.core.flac import FlacEncoder, DependencyChecker
-from tagqt.core.musicbrainz import MusicBrainzClient
 from tagqt.core.settings import Settings
+from tagqt.core.library import LibrarySession
 from tagqt.ui import dialogs
 from tagqt.ui.batch_status import ClickableProgressBar, BatchStatusDialog, ClickableLabel
 from tagqt.ui.workers import (
     LyricsWorker, AutoTagWorker, FolderLoaderWorker, RenameWorker,
     CoverFetchWorker, CoverResizeWorker, RomanizeWorker, CaseConvertWorker,
-    FlacReencodeWorker, CsvImportWorker, SaveWorker
+    FlacReencodeWorker, CsvImportWorker, CsvExportWorker, SaveWorker, FolderWatchWorker
 )
 import os
 
@@ -31,6 +30,7 @@ class MainWindow(QMainWindow):
         # Core Logic
         self.metadata = None
         self.current_file = None
+        self.load_failed = False
         self.lyrics_fetcher = LyricsFetcher()
         self.romanizer = Romanizer()
         self.cover_manager = CoverArtManager()
@@ -43,6 +43,9 @@ class MainWindow(QMainWindow):
         self._persistent_toast = None # (message, is_batch)
         self.thread = None
         self.worker = None
+        self.library = LibrarySession()
+        self.folder_watchers = {} # library root -> FolderWatchWorker
+        self._root_counts = {} # library root -> files loaded by the running scan
 
         # Central Widget
         central_widget = QWidget()
@@ -77,6 +80,11 @@ class MainWindow(QMainWindow):
         self.selection_timer.setSingleShot(True)
         self.selection_timer.timeout.connect(self._handle_selection_deferred)
         
+        # Filter Debounce Timer - typing only filters once the keystrokes pause
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.timeout.connect(self._apply_filter)
+        
         # Initialize Toast Manager
         from tagqt.ui.toast import ToastManager
         self.toast_manager = ToastManager(self)
@@ -195,6 +203,12 @@ class MainWindow(QMainWindow):
         # Filter Input
         self.filter_input = QLineEdit()
         self.filter_input.setPlaceholderText("Filter files by name, title, artist, album...")
+        self.filter_input.setToolTip(
+            "Plain words match filename, title, artist or album.\n"
+            "Fields: artist:\"boards of canada\" album: title: genre: comment: path:\n"
+            "Numbers: year:>=1998 year:1990..1999 bitrate:<256 duration:>3:30 track:1\n"
+            "Other: format:flac has:cover has:genre, exact match with artist:=name\n"
+            "Put - in front of a term or word to exclude it: -has:cover -live")
         self.filter_input.setClearButtonEnabled(True)
         self.filter_input.textChanged.connect(self.on_filter_changed)
         self.filter_input.setStyleSheet(f"""
@@ -217,7 +231,9 @@ class MainWindow(QMainWindow):
         self.file_list.setContextMenuPolicy(Qt.CustomContextMenu)
         self.file_list.customContextMenuRequested.connect(self.show_context_menu)
         self.file_list.files_dropped.connect(self.on_files_dropped)
-        self.file_list.itemSelectionChanged.connect(self.on_selection_changed)
+        self.file_list.selection_changed.connect(self.on_selection_changed)
+        self.file_list.set_hidden_columns(self.settings.get_hidden_columns())
+        self.file_list.hidden_columns_changed.connect(self.settings.set_hidden_columns)
         left_panel.addWidget(self.file_list)
         
         content_layout.addLayout(left_panel, stretch=2)
@@ -228,6 +244,15 @@ class MainWindow(QMainWindow):
         self.sidebar.romanize_clicked.connect(self.romanize_metadata)
         self.sidebar.lyrics_clicked.connect(self.fetch_lyrics)
         self.sidebar.cover_clicked.connect(self.search_cover)
+        
+        # Covers and tags of the selected file are read in the background, see load_file
+        from tagqt.ui.covers import CoverLoader
+        from tagqt.core.thumbs import ThumbnailCache
+        self.cover_loader = CoverLoader(ThumbnailCache())
+        self.cover_loader.loaded.connect(self.on_cover_loaded)
+        from tagqt.ui.loader import MetadataLoader
+        self.metadata_loader = MetadataLoader()
+        self.metadata_loader.loaded.connect(self.on_metadata_loaded)
         self.sidebar.load_cover_clicked.connect(self.load_cover_from_file)
         self.sidebar.load_lyrics_clicked.connect(self.load_lyrics_from_file)
         self.sidebar.cancel_global_clicked.connect(self.exit_global_mode)
@@ -254,6 +279,8 @@ class MainWindow(QMainWindow):
         self.command_palette = CommandPalette(self)
         self.command_palette.register_commands([
             {"name": "Open Folder", "shortcut": "Ctrl+O", "callback": self.open_folder_dialog},
+            {"name": "Add Folder to Library", "shortcut": "Ctrl+Shift+O", "callback": self.add_folder_dialog},
+            {"name": "Reopen Last Library", "shortcut": "", "callback": self.reopen_library},
             {"name": "Save Changes", "shortcut": "Ctrl+S", "callback": self.save_metadata},
             {"name": "Get Covers (All)", "shortcut": "", "callback": self.fetch_all_covers},
             {"name": "Get Lyrics (All)", "shortcut": "", "callback": self.fetch_all_lyrics},
@@ -272,6 +299,7 @@ class MainWindow(QMainWindow):
         self.command_palette.show()
 
     def closeEvent(self, event):
+        self._stop_folder_watcher()
         try:
             if self.batch_running and hasattr(self, 'worker') and self.worker:
                 self.worker.stop()
@@ -345,7 +373,7 @@ class MainWindow(QMainWindow):
         self.thread.finished.connect(self.thread.deleteLater)
         
         self.worker.progress.connect(self.on_batch_progress)
-        self.worker.result.connect(result_handler or self.on_batch_result)
+        self.worker.results.connect(result_handler or self.on_batch_results)
         self.worker.finished.connect(self.on_batch_finished)
         if connect_log and hasattr(self.worker, 'log'):
             self.worker.log.connect(self.on_batch_log)
@@ -370,6 +398,18 @@ class MainWindow(QMainWindow):
         open_folder_action.triggered.connect(self.open_folder_dialog)
         file_menu.addAction(open_folder_action)
         
+        add_folder_action = QAction("Add Folder to Library...", self)
+        add_folder_action.setShortcut("Ctrl+Shift+O")
+        add_folder_action.triggered.connect(self.add_folder_dialog)
+        file_menu.addAction(add_folder_action)
+        
+        self.library_menu = file_menu.addMenu("Remove Folder from Library")
+        self.update_library_menu()
+        
+        reopen_library_action = QAction("Reopen Last Library", self)
+        reopen_library_action.triggered.connect(self.reopen_library)
+        file_menu.addAction(reopen_library_action)
+        
         self.recent_menu = file_menu.addMenu("Recent Folders")
         self.update_recent_menu()
         
@@ -494,6 +534,20 @@ class MainWindow(QMainWindow):
         view_album_artist_action.triggered.connect(lambda: self.change_display_mode("Album Artist"))
         view_by_menu.addAction(view_album_artist_action)
         
+        cover_filter_menu = view_menu.addMenu("Show Tracks")
+        
+        show_all_action = QAction("All", self)
+        show_all_action.triggered.connect(lambda: self.file_list.set_cover_filter(None))
+        cover_filter_menu.addAction(show_all_action)
+        
+        show_with_cover_action = QAction("With Cover", self)
+        show_with_cover_action.triggered.connect(lambda: self.file_list.set_cover_filter(True))
+        cover_filter_menu.addAction(show_with_cover_action)
+        
+        show_without_cover_action = QAction("Without Cover", self)
+        show_without_cover_action.triggered.connect(lambda: self.file_list.set_cover_filter(False))
+        cover_filter_menu.addAction(show_without_cover_action)
+        
         view_menu.addSeparator()
         
         appearance_menu = view_menu.addMenu("Appearance")
@@ -503,6 +557,14 @@ class MainWindow(QMainWindow):
         self.theme_action.triggered.connect(self.toggle_theme)
         appearance_menu.addAction(self.theme_action)
         
+        from tagqt.core.watcher import is_available
+        self.watch_action = QAction("Watch Folder for Changes", self)
+        self.watch_action.setCheckable(True)
+        self.watch_action.setEnabled(is_available())
+        self.watch_action.setChecked(is_available() and self.settings.get_watch_folders())
+        self.watch_action.triggered.connect(self.toggle_folder_watching)
+        view_menu.addAction(self.watch_action)
+        
 
         
         # Help Menu
@@ -605,26 +667,8 @@ class MainWindow(QMainWindow):
 
     def enter_global_mode(self):
         # Select all VISIBLE files
-        # First clear selection
-        self.file_list.clearSelection()
-        
-        # Iterate and select visible
-        iterator = QTreeWidgetItemIterator(self.file_list)
-        has_visible = False
-        while iterator.value():
-            item = iterator.value()
-            if not item.isHidden():
-                item.setSelected(True)
-                has_visible = True
-            iterator += 1
-            
-        if not has_visible:
+        if not self.file_list.select_all_visible():
             self.show_toast("No files are currently visible to edit.")
-        else:
-            # Force update if needed, but selection change should trigger it
-            pass
-
-
 
     def exit_global_mode(self):
         self.sidebar.set_global_mode(False)
@@ -632,62 +676,22 @@ class MainWindow(QMainWindow):
         files = self.get_selected_files()
         if files:
             first_file = files[0]
-            
-            iterator = QTreeWidgetItemIterator(self.file_list)
-            found = False
-            while iterator.value():
-                item = iterator.value()
-                if item.data(0, Qt.UserRole) == first_file:
-                    self.file_list.clearSelection()
-                    self.file_list.setCurrentItem(item)
-                    item.setSelected(True)
-                    found = True
-                    break
-                iterator += 1
-            
-            if found:
+            if self.file_list.select_file(first_file):
                 self.load_file(first_file)
-            else:
-                self.file_list.clearSelection()
         else:
             self.file_list.clearSelection()
 
     def get_selected_files(self):
-        # Helper to get selected files from FileList
-        # Currently FileList is single selection mostly, but we should support multi-selection for tools
-        # For now, let's just use the current file if single, or all files if we implement multi-select later.
-        # But wait, FileList is a QTreeWidget.
-        selected_items = self.file_list.selectedItems()
-        files = []
-        for item in selected_items:
-            filepath = item.data(0, Qt.UserRole)
-            if filepath:
-                files.append(filepath)
-            else:
-                # It's a group, maybe add children?
-                for i in range(item.childCount()):
-                    child = item.child(i)
-                    fp = child.data(0, Qt.UserRole)
-                    if fp:
-                        files.append(fp)
-        return list(set(files)) # Unique
+        # Selected groups count as all of their tracks
+        return self.file_list.selected_files()
         
     def get_all_files(self):
-        # Helper to get all files in the list
-        # MODIFIED: Only return VISIBLE files to support scoped bulk operations
-        files = []
-        iterator = QTreeWidgetItemIterator(self.file_list)
-        while iterator.value():
-            item = iterator.value()
-            # Check if item is hidden
-            if not item.isHidden():
-                filepath = item.data(0, Qt.UserRole)
-                if filepath:
-                    files.append(filepath)
-            iterator += 1
-        return list(set(files))
-
-
+        # Only VISIBLE files, so bulk operations are scoped by the filter
+        if self.filter_timer.isActive():
+            # Typed just now, apply it before taking the files
+            self.filter_timer.stop()
+            self._apply_filter()
+        return self.file_list.visible_files()
 
     def show_batch_details(self):
         if not self._status_is_batch:
@@ -737,6 +741,11 @@ class MainWindow(QMainWindow):
             self.progress_bar.setFormat(f"Processing... {target_value}%")
         self.batch_dialog.update_progress(current, total)
         
+    def on_batch_results(self, results):
+        # Workers send the results of many files at once
+        for filepath, status, message in results:
+            self.on_batch_result(filepath, status, message)
+
     def on_batch_result(self, filepath, status, message):
         self.batch_dialog.add_result(filepath, status, message)
         if status in ["Updated", "Success", "Found"]:
@@ -774,16 +783,16 @@ class MainWindow(QMainWindow):
         self.progress_bar.setValue(self.progress_bar.maximum())
         
         # Generate detailed summary
-        results = self.batch_dialog.results
-        total = len(results)
+        counts = self.batch_dialog.counts
+        total = sum(counts.values())
         
         if total == 0:
             self.show_toast("Done (No files processed)", is_batch=True)
             return
 
-        success_count = len([r for r in results if r['status'] in ['Success', 'Updated', 'Found', 'Renamed']])
-        skipped_count = len([r for r in results if r['status'] == 'Skipped'])
-        error_count = len([r for r in results if r['status'] in ['Error', 'Missing', 'Failed']])
+        success_count = counts['success']
+        skipped_count = counts['skipped']
+        error_count = counts['error']
         
         if skipped_count == total:
             msg = f"Skipped, {total} files already up to date."
@@ -800,11 +809,7 @@ class MainWindow(QMainWindow):
             
         self.show_toast(msg, is_batch=True)
         
-        # If we are in a grouped mode, we need a full refresh at the end
-        # to ensure items are in the correct groups if their tags changed.
-        if self.file_list.current_mode != "File":
-            self.file_list.refresh_view()
-            
+        # Updated tracks already moved to their new groups as results came in
         if self.current_file:
              self.load_file(self.current_file)
 
@@ -895,10 +900,12 @@ class MainWindow(QMainWindow):
         self._show_rename_dialog(files)
 
     def _show_rename_dialog(self, files):
-        # We need metadata for preview
+        # We need metadata for preview, the loaded track records already have it
+        from tagqt.core.tags import MetadataHandler
+        records = dict(self.file_list.all_files)
         file_data = []
         for f in files:
-            md = MetadataHandler(f)
+            md = records.get(f) or MetadataHandler(f)
             file_data.append((f, md))
             
         from tagqt.ui.rename import RenamerDialog
@@ -915,7 +922,11 @@ class MainWindow(QMainWindow):
             self.progress_bar.setRange(0, len(rename_data))
             self.progress_bar.setFormat("Renaming... 0%")
             
-            self._start_batch_worker(RenameWorker(rename_data), result_handler=self.on_rename_result)
+            self._start_batch_worker(RenameWorker(rename_data), result_handler=self.on_rename_results)
+
+    def on_rename_results(self, results):
+        for old_path, status, message in results:
+            self.on_rename_result(old_path, status, message)
 
     def on_rename_result(self, old_path, status, message):
         self.batch_dialog.add_result(old_path, status, message)
@@ -990,12 +1001,14 @@ class MainWindow(QMainWindow):
         if not filepath:
             return
         
-        from tagqt.core.csv_io import export_metadata_to_csv
-        success, error = export_metadata_to_csv(files, filepath)
-        if success:
-            self.show_toast(f"Exported {len(files)} files to CSV")
-        else:
-            dialogs.show_warning(self, "Export Failed", error)
+        if not self._prepare_batch("CSV Export Status"):
+            return
+            
+        self.progress_bar.setRange(0, len(files))
+        self.progress_bar.setFormat("Exporting... 0%")
+        
+        # Lyrics are read from every file, which is a full tag parse each
+        self._start_batch_worker(CsvExportWorker(files, filepath))
 
     def import_from_csv(self):
         filepath, _ = QFileDialog.getOpenFileName(
@@ -1068,15 +1081,73 @@ class MainWindow(QMainWindow):
             self.load_folder(folder_path)
 
     def load_folder(self, folder_path):
+        """Starts a new library session with folder_path as its only root."""
         if not self._prepare_batch("Loading Folder"):
             return
-            
-        self.progress_bar.setFormat("Scanning folder...")
+        self._stop_folder_watcher()
+        self.file_list.clear_files()
+        self.library.clear()
+        self.library.add(folder_path)
+        self._load_roots(self.library.roots)
+
+    def add_folder_dialog(self):
+        folder_path = QFileDialog.getExistingDirectory(self, "Add Folder to Library")
+        if folder_path:
+            self.add_library_folder(folder_path)
+
+    def add_library_folder(self, folder_path):
+        """Adds a root to the current session; the roots already loaded are not rescanned."""
+        if not self.library.roots:
+            self.load_folder(folder_path)
+            return
+        if self.library.root_of(folder_path):
+            self.show_toast(f"{os.path.basename(folder_path)} is already in the library")
+            return
+        if not self._prepare_batch("Loading Folder"):
+            return
+        _, absorbed = self.library.add(folder_path)
+        # A parent folder replaces the roots it contains, their rows come back from the index
+        for root in absorbed:
+            self._drop_root_files(root)
+        self._load_roots([self.library.roots[-1]])
+
+    def remove_library_folder(self, root):
+        if self.batch_running:
+            dialogs.show_warning(self, "Busy", "Please wait for the current operation to finish.")
+            return
+        self.library.remove(root)
+        self._drop_root_files(root)
+        self.settings.set_library_roots(self.library.roots)
+        self.update_library_menu()
+        self.show_toast(f"Removed {os.path.basename(root)} from the library")
+
+    def reopen_library(self):
+        roots = [root for root in self.settings.get_library_roots() if os.path.isdir(root)]
+        if not roots:
+            self.show_toast("No saved library folders")
+            return
+        if not self._prepare_batch("Loading Library"):
+            return
+        self._stop_folder_watcher()
+        self.file_list.clear_files()
+        self.library = LibrarySession(roots)
+        self._load_roots(self.library.roots)
+
+    def _drop_root_files(self, root):
+        self._stop_folder_watcher(root)
+        prefix = os.path.join(root, "")
+        removed = [path for path, _ in self.file_list.all_files if path.startswith(prefix)]
+        self.on_folder_changed([], removed)
+
+    def _load_roots(self, roots):
+        # Callers have already set up the batch with _prepare_batch()
+        self.progress_bar.setFormat("Scanning folder..." if len(roots) == 1 else f"Scanning {len(roots)} folders...")
         self.progress_bar.setRange(0, 0) # Indeterminate
+        self.update_library_menu()
         
         # Create Thread and Worker
         self.thread = QThread()
-        self.worker = FolderLoaderWorker(folder_path)
+        self.worker = FolderLoaderWorker(roots, workers=self.settings.get_scan_workers())
         self.worker.moveToThread(self.thread)
         
         # Connect signals
@@ -1085,36 +1156,102 @@ class MainWindow(QMainWindow):
         self.worker.finished.connect(self.worker.deleteLater)
         self.thread.finished.connect(self.thread.deleteLater)
         
+        # Rows are appended as the worker streams them in
+        self.worker.progress.connect(self.on_batch_progress)
+        self.worker.root_progress.connect(self.on_root_progress)
+        self.worker.chunk.connect(self.file_list.append_files)
         self.worker.finished.connect(self.on_folder_loaded)
         
         # Start
         self.thread.start()
 
-    def on_folder_loaded(self, results, folder_path):
+    def on_root_progress(self, root, loaded, found):
+        self._root_counts[root] = loaded
+        self.batch_dialog.add_result(root, "Loading", f"{loaded} of {found} files found so far")
+
+    def on_folder_loaded(self, count, roots):
         self.batch_container.setVisible(False)
-        self.file_list.clear_files()
-        if results:
-            self.file_list.add_files(results)
         
-        self.settings.add_recent_folder(folder_path)
+        for root in roots:
+            self.settings.add_recent_folder(root)
         self.update_recent_menu()
+        self.settings.set_library_roots(self.library.roots)
+        if self.watch_action.isChecked():
+            for root in roots:
+                self._start_folder_watcher(root)
         
         self.progress_bar.setRange(0, 100)
         self.progress_bar.setValue(100)
         self.batch_running = False
         
         # Add result to batch dialog for details
-        if results:
-            self.batch_dialog.add_result(folder_path, "Success", f"Loaded {len(results)} files.")
-        else:
-            self.batch_dialog.add_result(folder_path, "Skipped", "No audio files found.")
+        for root in roots:
+            loaded = self._root_counts.pop(root, 0)
+            if loaded:
+                self.batch_dialog.add_result(root, "Success", f"Loaded {loaded} files.")
+            else:
+                self.batch_dialog.add_result(root, "Skipped", "No audio files found.")
         self.batch_dialog.set_finished()
         self.batch_cancel_btn.setVisible(False)
         
-        if results:
-            self.show_toast(f"Loaded {len(results)} files from {os.path.basename(folder_path)}", is_batch=True)
+        name = os.path.basename(roots[0]) if len(roots) == 1 else f"{len(roots)} folders"
+        if count:
+            self.show_toast(f"Loaded {count} files from {name}", is_batch=True)
+        else:
+             self.show_toast(f"No audio files found in {name}", is_batch=False)
+
+    def toggle_folder_watching(self, checked):
+        self.settings.set_watch_folders(checked)
+        if checked:
+            for root in self.library.roots:
+                self._start_folder_watcher(root)
         else:
-             self.show_toast(f"No audio files found in {os.path.basename(folder_path)}", is_batch=False)
+            self._stop_folder_watcher()
+
+    def _start_folder_watcher(self, root):
+        self._stop_folder_watcher(root)
+        try:
+            watcher = FolderWatchWorker(root)
+            watcher.changed.connect(self.on_folder_changed)
+            watcher.overflow.connect(self.on_folder_watch_overflow)
+            watcher.log.connect(self.on_batch_log)
+            watcher.start()
+            self.folder_watchers[root] = watcher
+        except OSError as e:
+            print(f"Could not watch {root}: {e}")
+
+    def _stop_folder_watcher(self, root=None):
+        """Stops the watcher of root, or of every root when root is None."""
+        roots = list(self.folder_watchers) if root is None else [root]
+        for r in roots:
+            watcher = self.folder_watchers.pop(r, None)
+            if watcher:
+                watcher.stop()
+
+    def on_folder_changed(self, updated, removed):
+        self.file_list.apply_changes(updated, removed)
+        if self.current_file in removed:
+            self.current_file = None
+            self.metadata = None
+
+    def on_folder_watch_overflow(self, folder_path):
+        # Events were lost, only a rescan can tell what changed
+        if not self.batch_running and self._prepare_batch("Loading Folder"):
+            self.show_toast("Many files changed, reloading folder")
+            self._drop_root_files(folder_path)
+            self._load_roots([folder_path])
+
+    def update_library_menu(self):
+        self.library_menu.clear()
+        if not self.library.roots:
+            empty = QAction("No library folders", self)
+            empty.setEnabled(False)
+            self.library_menu.addAction(empty)
+            return
+        for root in self.library.roots:
+            action = QAction(root, self)
+            action.triggered.connect(lambda checked, r=root: self.remove_library_folder(r))
+            self.library_menu.addAction(action)
 
     def update_recent_menu(self):
         self.recent_menu.clear()
@@ -1248,6 +1385,7 @@ class MainWindow(QMainWindow):
         shortcuts_text = """
 <table width="100%" cellpadding="10" style="border-collapse: collapse;">
 <tr><td width="120"><code>Ctrl+O</code></td><td>Open folder</td></tr>
+<tr><td><code>Ctrl+Shift+O</code></td><td>Add folder to library</td></tr>
 <tr><td><code>Ctrl+S</code></td><td>Save changes</td></tr>
 <tr><td><code>Ctrl+G</code></td><td>Toggle Global Edit</td></tr>
 <tr><td><code>Ctrl+A</code></td><td>Select all files</td></tr>
@@ -1298,7 +1436,15 @@ class MainWindow(QMainWindow):
             self.load_file(files[0])
 
     def on_filter_changed(self, text):
-        self.file_list.set_filter(text)
+        if not text:
+            # Clearing the box is shown right away
+            self.filter_timer.stop()
+            self._apply_filter()
+            return
+        self.filter_timer.start(120)
+
+    def _apply_filter(self):
+        self.file_list.set_filter(self.filter_input.text())
 
     def on_selection_changed(self):
         # Restart timer (debounce) - waits for selection to stabilize
@@ -1319,7 +1465,27 @@ class MainWindow(QMainWindow):
             
     def load_file(self, filepath):
         self.current_file = filepath
-        self.metadata = MetadataHandler(filepath)
+        # Nothing to save until the file is read; stale loads are ignored in on_metadata_loaded
+        self.metadata = None
+        self.load_failed = False
+        self.sidebar.set_loading(True)
+        self.metadata_loader.request(filepath)
+        self.show_cover()
+        # Arrow keys usually go to the next or previous track next
+        neighbours = [(path, self.file_list.get_record(path)) for path in self.file_list.neighbours(filepath)]
+        self.metadata_loader.prefetch(neighbours)
+        self.cover_loader.prefetch([(path, rec) for path, rec in neighbours if rec is not None and rec.has_cover])
+
+    def on_metadata_loaded(self, path, metadata):
+        if path != self.current_file or getattr(self.sidebar, 'is_global_mode', False):
+            return
+        self.metadata = metadata
+        self.sidebar.set_loading(False)
+        if metadata is None:
+            # Leave the fields empty rather than locked
+            self.load_failed = True
+            self.show_toast(f"Could not read {os.path.basename(path)}")
+            return
         self.populate_sidebar()
 
     def populate_sidebar(self):
@@ -1342,15 +1508,6 @@ class MainWindow(QMainWindow):
         self.sidebar.key_edit.setText(self.metadata.initial_key)
         self.sidebar.isrc_edit.setText(self.metadata.isrc)
         self.sidebar.publisher_edit.setText(self.metadata.publisher)
-        
-        # Load cover
-        cover_data = self.metadata.get_cover()
-        if cover_data:
-            pixmap = QPixmap()
-            pixmap.loadFromData(cover_data)
-            self.sidebar.set_cover(pixmap)
-        else:
-            self.sidebar.set_cover(None)
             
         # Set specs
         specs = {
@@ -1360,6 +1517,22 @@ class MainWindow(QMainWindow):
         }
         self.sidebar.set_file_specs(specs)
 
+    def show_cover(self):
+        # Load cover off the UI thread; the scan already knows when there is none
+        record = self.file_list.get_record(self.current_file)
+        if record is not None and not record.has_cover:
+            self.sidebar.set_cover(None)
+        else:
+            cached = self.cover_loader.request(self.current_file, record)
+            if cached:
+                self.sidebar.set_cover(QPixmap.fromImage(cached[0]), cached[1])
+            else:
+                self.sidebar.set_cover_loading()
+
+    def on_cover_loaded(self, path, image, resolution):
+        if path == self.current_file and not getattr(self.sidebar, 'is_global_mode', False):
+            self.sidebar.set_cover(QPixmap.fromImage(image), resolution)
+
     def save_metadata(self):
         if getattr(self.sidebar, 'is_global_mode', False):
             files = self.get_selected_files()
@@ -1381,6 +1554,10 @@ class MainWindow(QMainWindow):
         else:
             # Single file save
             if not self.metadata:
+                if self.load_failed:
+                    self.show_toast("Could not read the file, nothing was saved")
+                elif self.current_file:
+                    self.show_toast("Still reading the file, try again in a moment")
                 return
                 
             self.metadata.title = self.sidebar.title_edit.text()
@@ -1401,10 +1578,12 @@ class MainWindow(QMainWindow):
             self.metadata.publisher = self.sidebar.publisher_edit.text()
             
             self.metadata.save()
+            self.metadata_loader.forget(self.current_file)
             
             # Save cover.jpg if we have cover data (always overwrite on manual save)
-            if self.metadata.get_cover():
-                self.metadata.save_cover_file(overwrite=True)
+            cover_data = self.metadata.get_cover()
+            if cover_data:
+                self.metadata.save_cover_file(cover_data, overwrite=True)
                 
             self.show_toast("Changes saved")
             
@@ -1480,6 +1659,8 @@ class MainWindow(QMainWindow):
                     
                     if self.metadata:
                         self.metadata.set_cover(data)
+                        # Holds an unsaved cover now, reread the file next time
+                        self.metadata_loader.forget(self.current_file)
             except Exception as e:
                 dialogs.show_error(self, "Error", f"Error downloading cover: {e}")
 
@@ -1496,6 +1677,8 @@ class MainWindow(QMainWindow):
                     self.sidebar.set_cover(pixmap)
                     if self.metadata:
                         self.metadata.set_cover(data)
+                        # Holds an unsaved cover now, reread the file next time
+                        self.metadata_loader.forget(self.current_file)
                 else:
                     dialogs.show_warning(self, "Invalid Image", "The selected file is not a valid image.")
             except Exception as e:
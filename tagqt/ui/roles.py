@@ -0,0 +1,9 @@
+from PySide6.QtCore import Qt
+
+# Qt enum members bound once: looking one up costs microseconds, and the
+# models' data() compares the role for every painted cell
+DISPLAY_ROLE = Qt.DisplayRole
+ALIGNMENT_ROLE = Qt.TextAlignmentRole
+TOOLTIP_ROLE = Qt.ToolTipRole
+FOREGROUND_ROLE = Qt.ForegroundRole
+ALIGN_CENTER = Qt.AlignCenter
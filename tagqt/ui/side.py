@@ -291,11 +291,14 @@ class Sidebar(QWidget):
             }}
         """)
 
-    def set_cover(self, pixmap):
+    def set_cover(self, pixmap, resolution=None):
+        """resolution: size of the original image, for a pixmap that was decoded scaled down."""
         if pixmap and not pixmap.isNull():
-            self.cover_label.setPixmap(pixmap.scaled(200, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+            if pixmap.width() > 200 or pixmap.height() > 200:
+                pixmap = pixmap.scaled(200, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            self.cover_label.setPixmap(pixmap)
             self.cover_label.setText("")
-            self._current_res = f"{pixmap.width()}x{pixmap.height()}"
+            self._current_res = resolution or f"{pixmap.width()}x{pixmap.height()}"
         else:
             self.cover_label.setPixmap(QPixmap())
             self.cover_label.setText("No Cover")
@@ -303,6 +306,29 @@ class Sidebar(QWidget):
             
         self._update_info_label()
 
+    def set_cover_loading(self):
+        # Blank rather than "No Cover" while the cover is decoded in the background
+        self.cover_label.setPixmap(QPixmap())
+        self.cover_label.setText("")
+        self._current_res = ""
+        self._update_info_label()
+
+    def _tag_edits(self):
+        return [self.title_edit, self.artist_edit, self.album_edit, self.album_artist_edit,
+                self.year_edit, self.genre_edit, self.disc_edit, self.track_edit, self.bpm_edit,
+                self.key_edit, self.isrc_edit, self.publisher_edit, self.comment_edit, self.lyrics_edit]
+
+    def set_loading(self, loading):
+        """Empties and locks the fields while the selected file is read, so nothing is typed over the previous track."""
+        for widget in self._tag_edits():
+            if loading:
+                widget.clear()
+            widget.setEnabled(not loading)
+        self.save_btn.setEnabled(not loading)
+        if loading:
+            self._current_specs = ""
+            self._update_info_label()
+
     def set_file_specs(self, specs):
         """
         specs: dict with keys 'bitrate', 'sample_rate', 'filesize'
@@ -334,6 +360,7 @@ class Sidebar(QWidget):
         - Shows placeholder cover art.
         """
         self.is_global_mode = enabled
+        self.set_loading(False)
         
         # Unique fields to hide entirely (with their labels)
         unique_widgets = [
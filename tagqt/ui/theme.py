@@ -159,7 +159,7 @@ class Theme:
             }}
 
             /* Tree Widget (File List) */
-            QTreeWidget {{
+            QTreeWidget, FileList, BatchStatusDialog QTreeView {{
                 background-color: {Theme.MANTLE};
                 alternate-background-color: {Theme.SURFACE0};
                 border: 1px solid {Theme.SURFACE0};
@@ -167,19 +167,23 @@ class Theme:
                 padding: 5px;
                 outline: none;
             }}
-            QTreeWidget::item {{
+            QTreeWidget::item, FileList::item,
+            BatchStatusDialog QTreeView::item {{
                 padding: 10px 8px;
                 border-radius: 4px;
                 color: {Theme.SUBTEXT1};
             }}
-            QTreeWidget::item:alternate {{
+            QTreeWidget::item:alternate, FileList::item:alternate,
+            BatchStatusDialog QTreeView::item:alternate {{
                 background-color: {Theme.SURFACE0};
             }}
-            QTreeWidget::item:selected {{
+            QTreeWidget::item:selected, FileList::item:selected,
+            BatchStatusDialog QTreeView::item:selected {{
                 background-color: {Theme.SURFACE1};
                 color: {Theme.ACCENT};
             }}
-            QTreeWidget::item:hover {{
+            QTreeWidget::item:hover, FileList::item:hover,
+            BatchStatusDialog QTreeView::item:hover {{
                 background-color: {Theme.SURFACE0};
             }}
             QHeaderView::section {{
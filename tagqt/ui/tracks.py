@@ -1,11 +1,420 @@
-from PySide6.QtWidgets import QTreeWidget, QAbstractItemView, QTreeWidgetItem, QHeaderView, QTreeWidgetItemIterator, QMenu
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import QTreeView, QAbstractItemView, QHeaderView, QMenu
+from PySide6.QtCore import Qt, Signal, QAbstractItemModel, QModelIndex, QItemSelection, QItemSelectionModel
 from PySide6.QtGui import QAction
 import os
-from tagqt.core.tags import MetadataHandler
+import bisect
+import itertools
+from tagqt.core.library import TrackRecord
+from tagqt.core.store import TrackStore, natural_key, EMPTY_SORT_KEYS
+from tagqt.core.query import Query, parse_query
+from tagqt.ui.roles import DISPLAY_ROLE, ALIGNMENT_ROLE, ALIGN_CENTER
 
-class FileList(QTreeWidget):
+GROUP_MODES = ["Album", "Artist", "Album Artist"]
+CENTERED_COLUMNS = {5, 7, 8, 9} # Year, Disc, Track, Cover
+
+PATH_ROLE = Qt.UserRole
+RECORD_ROLE = Qt.UserRole + 1
+
+
+class _Group:
+    __slots__ = ['gid', 'key', 'sort_key', 'slots']
+
+    def __init__(self, gid, key):
+        self.gid = gid
+        self.key = key
+        self.sort_key = (natural_key(key), key) # groups are ordered by it
+        self.slots = []
+
+
+class TrackModel(QAbstractItemModel):
+    """Two level model over a TrackStore: tracks, or groups of tracks in the grouped modes.
+
+    Rows only hold store slots that pass the filter, the column text is read
+    from the store when a row is painted. Index internal ids are 0 for top
+    level rows and the group id for tracks inside a group.
+
+    Tracks are in store order, or ordered by the precomputed sort keys of a
+    column after sort(); ties keep store order. Groups are always in natural
+    order of their keys.
+    """
+
+    def __init__(self, store, headers):
+        super().__init__()
+        self.store = store
+        self.headers = headers
+        self.mode = "File"
+        self.grouped = False
+        self.matches = lambda slot: True
+        self._top = [] # slots in File mode, _Group objects in grouped modes
+        self._group_keys = [] # sort keys of the groups, parallel to _top in grouped modes
+        self._groups = {} # key -> _Group
+        self._groups_by_id = {}
+        self._next_gid = 1
+        self._row_of = {} # slot -> row within its parent
+        self.sort_column = -1 # -1 keeps store order
+        self.sort_order = Qt.AscendingOrder
+        self._descending = False
+
+    @property
+    def _sort_keys(self):
+        """The store's sort keys of sort_column, or None; looked up each time since clearing the store replaces them."""
+        return self.store.sort_keys(self.sort_column) if self.sort_column >= 0 else None
+
+    def set_mode(self, mode, slots=None):
+        self.mode = mode
+        # Read for every row Qt lays out, so it is kept as a plain attribute
+        self.grouped = mode in GROUP_MODES
+        self.rebuild(slots)
+
+    def group_key(self, record):
+        if self.mode == "Album":
+            return record.album or "Unknown Album"
+        elif self.mode == "Artist":
+            return record.artist or "Unknown Artist"
+        elif self.mode == "Album Artist":
+            return record.album_artist or record.artist or "Unknown Artist"
+        return "Unknown"
+
+    # Qt model interface
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid():
+            if parent.internalId() or not self.grouped:
+                return QModelIndex()
+            group = self._top[parent.row()]
+            if 0 <= row < len(group.slots):
+                return self.createIndex(row, column, group.gid)
+            return QModelIndex()
+        if 0 <= row < len(self._top):
+            return self.createIndex(row, column, 0)
+        return QModelIndex()
+
+    def parent(self, index):
+        if not index.isValid() or not index.internalId():
+            return QModelIndex()
+        group = self._groups_by_id[index.internalId()]
+        return self.createIndex(bisect.bisect_left(self._group_keys, group.sort_key), 0, 0)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self._top)
+        if self.grouped and not parent.internalId() and parent.column() == 0:
+            return len(self._top[parent.row()].slots)
+        return 0
+
+    def hasChildren(self, parent=QModelIndex()):
+        # Asked for every row on layout; groups are never empty
+        if not parent.isValid():
+            return bool(self._top)
+        return self.grouped and not parent.internalId()
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.headers)
+
+    def data(self, index, role=DISPLAY_ROLE):
+        if not index.isValid():
+            return None
+        slot = self.slot_at(index)
+        if slot is None:
+            # Group row
+            if role == DISPLAY_ROLE and index.column() == 0:
+                return self._top[index.row()].key
+            return None
+        if role == DISPLAY_ROLE:
+            return self.store.columns[index.column()][slot]
+        if role == ALIGNMENT_ROLE and index.column() in CENTERED_COLUMNS:
+            return ALIGN_CENTER
+        if role == PATH_ROLE:
+            return self.store.paths[slot]
+        if role == RECORD_ROLE:
+            return self.store.records[slot]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            if section == 0 and self.grouped:
+                return self.mode
+            return self.headers[section]
+        return None
+
+    # Row bookkeeping
+
+    def slot_at(self, index):
+        """Store slot of a track index, None for group rows."""
+        gid = index.internalId()
+        if gid:
+            return self._groups_by_id[gid].slots[index.row()]
+        if self.grouped:
+            return None
+        return self._top[index.row()]
+
+    def group_at(self, index):
+        if index.isValid() and self.grouped and not index.internalId():
+            return self._top[index.row()]
+        return None
+
+    def index_of(self, slot):
+        row = self._row_of.get(slot)
+        if row is None:
+            return QModelIndex()
+        if not self.grouped:
+            return self.createIndex(row, 0, 0)
+        group = self._groups[self.group_key(self.store.records[slot])]
+        return self.createIndex(row, 0, group.gid)
+
+    def visible_slots(self):
+        if self.grouped:
+            return [slot for group in self._top for slot in group.slots]
+        return list(self._top)
+
+    def group_row(self, key):
+        """Top level row of the group with key, which must exist."""
+        return bisect.bisect_left(self._group_keys, self._groups[key].sort_key)
+
+    def _new_group(self, key):
+        group = _Group(self._next_gid, key)
+        self._next_gid += 1
+        self._groups[key] = group
+        self._groups_by_id[group.gid] = group
+        return group
+
+    def _reindex(self, slots, start=0):
+        self._row_of.update(zip(slots[start:] if start else slots, range(start, len(slots))))
+
+    def rebuild(self, slots=None):
+        """Recomputes every row, e.g. after the mode or the filter changed.
+
+        slots: the slots to show in store order, when the caller already
+        filtered them; by default every stored slot is checked with matches.
+        """
+        self.beginResetModel()
+        self._top = []
+        self._group_keys = []
+        self._groups = {}
+        self._groups_by_id = {}
+        self._row_of = {}
+        if slots is None:
+            slots = [slot for slot in self.store.slots() if self.matches(slot)]
+        else:
+            slots = list(slots)
+        if self.grouped:
+            for slot in slots:
+                key = self.group_key(self.store.records[slot])
+                group = self._groups.get(key) or self._new_group(key)
+                group.slots.append(slot)
+            self._top = sorted(self._groups.values(), key=lambda group: group.sort_key)
+            self._group_keys = [group.sort_key for group in self._top]
+            for group in self._top:
+                self._order(group.slots)
+                self._reindex(group.slots)
+        else:
+            self._top = slots
+            self._order(self._top)
+            self._reindex(self._top)
+        self.endResetModel()
+
+    # Sorting
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Orders the tracks by column, or back to store order for column -1."""
+        if self.is_sorted(column, order):
+            return
+        self.layoutAboutToBeChanged.emit()
+        self._sort_rows(column, order)
+        self.layoutChanged.emit()
+
+    def sort_in_place(self, column, order):
+        """Like sort(), but reported as changed row contents instead of a new layout.
+
+        Every parent keeps the same number of rows, so views only repaint
+        instead of laying out every row again. Selection ranges would be torn
+        apart by the move though: the caller clears the selection before and
+        restores it after. Returns False when the order did not change.
+        """
+        if self.is_sorted(column, order):
+            return False
+        self._sort_rows(column, order)
+        last = len(self.headers) - 1
+        if self.grouped:
+            for group in self._top:
+                self.dataChanged.emit(self.createIndex(0, 0, group.gid),
+                                      self.createIndex(len(group.slots) - 1, last, group.gid))
+        elif self._top:
+            self.dataChanged.emit(self.createIndex(0, 0, 0), self.createIndex(len(self._top) - 1, last, 0))
+        return True
+
+    def is_sorted(self, column, order):
+        # Rows are kept in order as tracks change
+        return column == self.sort_column and (column < 0 or order == self.sort_order)
+
+    def _sort_rows(self, column, order):
+        self.sort_column = column
+        self.sort_order = order
+        self._descending = order == Qt.DescendingOrder
+        # Group rows stay where they are, track indexes follow their slot
+        old = [index for index in self.persistentIndexList() if self.slot_at(index) is not None]
+        moved = [(self.slot_at(index), index.column(), index.internalId()) for index in old]
+        for rows_list in ([group.slots for group in self._top] if self.grouped else [self._top]):
+            self._order(rows_list)
+            self._reindex(rows_list)
+        self.changePersistentIndexList(old, [self.createIndex(self._row_of[slot], col, gid)
+                                             for slot, col, gid in moved])
+
+    def _order(self, rows_list):
+        """Sorts slots in place into row order."""
+        rows_list.sort()
+        keys = self._sort_keys
+        if keys is not None:
+            # Keys are computed once per track, the sort only compares them; a stable sort keeps ties in store order
+            rows_list.sort(key=keys.__getitem__, reverse=self._descending)
+            if self._descending:
+                # Empty values sorted to the front, they go back to the end
+                empty = sum(1 for _ in itertools.takewhile(lambda slot: keys[slot] in EMPTY_SORT_KEYS, rows_list))
+                if empty:
+                    rows_list[:] = rows_list[empty:] + rows_list[:empty]
+
+    def _before(self, slot, other):
+        """True if slot's row goes above other's."""
+        keys = self._sort_keys
+        if keys is None or keys[slot] == keys[other]:
+            return slot < other
+        if not self._descending:
+            return keys[slot] < keys[other]
+        if (keys[other] in EMPTY_SORT_KEYS) != (keys[slot] in EMPTY_SORT_KEYS):
+            return keys[other] in EMPTY_SORT_KEYS
+        return keys[slot] > keys[other]
+
+    def _position(self, rows_list, slot):
+        """Row slot goes to in rows_list."""
+        lo, hi = 0, len(rows_list)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._before(slot, rows_list[mid]):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def in_order(self, slot):
+        """True if the shown row of slot is still between its neighbours, e.g. after an edit."""
+        row = self._row_of[slot]
+        if self.grouped:
+            rows_list = self._groups[self.group_key(self.store.records[slot])].slots
+        else:
+            rows_list = self._top
+        return ((row == 0 or self._before(rows_list[row - 1], slot))
+                and (row == len(rows_list) - 1 or self._before(slot, rows_list[row + 1])))
+
+    def insert_slots(self, slots):
+        """Adds rows for slots, in row order within their parent."""
+        slots = [slot for slot in slots if self.matches(slot)]
+        if not slots:
+            return
+        self._order(slots)
+        if not self.grouped:
+            self._insert_rows(QModelIndex(), self._top, slots)
+            return
+
+        buckets = {}
+        for slot in slots:
+            buckets.setdefault(self.group_key(self.store.records[slot]), []).append(slot)
+        for key, group_slots in buckets.items():
+            group = self._groups.get(key)
+            if group is None:
+                # New group, inserted in sorted position together with its tracks
+                group = self._new_group(key)
+                group.slots = group_slots
+                pos = bisect.bisect(self._group_keys, group.sort_key)
+                self.beginInsertRows(QModelIndex(), pos, pos)
+                self._group_keys.insert(pos, group.sort_key)
+                self._top.insert(pos, group)
+                self._reindex(group.slots)
+                self.endInsertRows()
+            else:
+                parent = self.createIndex(self.group_row(key), 0, 0)
+                self._insert_rows(parent, group.slots, group_slots)
+
+    def _insert_rows(self, parent, rows_list, slots):
+        """Inserts slots, already in row order, into rows_list of parent."""
+        if not rows_list or self._before(rows_list[-1], slots[0]):
+            # Newly added tracks in store order, the common case, go to the end in one call
+            start = len(rows_list)
+            self.beginInsertRows(parent, start, start + len(slots) - 1)
+            rows_list.extend(slots)
+            self._reindex(rows_list, start)
+            self.endInsertRows()
+            return
+        # Tracks that moved here, came back into the filter or land between sorted rows.
+        # Slots going to the same place are inserted in one call, the last place first so
+        # the positions found in the unchanged list stay valid.
+        runs = []
+        for slot in slots:
+            pos = self._position(rows_list, slot)
+            if runs and runs[-1][0] == pos:
+                runs[-1][1].append(slot)
+            else:
+                runs.append((pos, [slot]))
+        for pos, run in reversed(runs):
+            self.beginInsertRows(parent, pos, pos + len(run) - 1)
+            rows_list[pos:pos] = run
+            self.endInsertRows()
+        self._reindex(rows_list, runs[0][0])
+
+    def remove_slots(self, slots, keys=None):
+        """Removes the rows of slots; keys maps a slot to the group key it was shown under."""
+        by_parent = {}
+        for slot in slots:
+            row = self._row_of.get(slot)
+            if row is None:
+                continue
+            if self.grouped:
+                key = keys[slot] if keys and slot in keys else self.group_key(self.store.records[slot])
+                by_parent.setdefault(key, []).append(row)
+            else:
+                by_parent.setdefault(None, []).append(row)
+
+        for key, rows in by_parent.items():
+            if key is None:
+                parent, rows_list = QModelIndex(), self._top
+            else:
+                group = self._groups[key]
+                parent = self.createIndex(self.group_row(key), 0, 0)
+                rows_list = group.slots
+            # Highest rows first so lower row numbers stay valid, adjacent rows go in one call
+            rows = sorted(rows, reverse=True)
+            i = 0
+            while i < len(rows):
+                last = first = rows[i]
+                i += 1
+                while i < len(rows) and rows[i] == first - 1:
+                    first = rows[i]
+                    i += 1
+                self.beginRemoveRows(parent, first, last)
+                for slot in rows_list[first:last + 1]:
+                    del self._row_of[slot]
+                del rows_list[first:last + 1]
+                self.endRemoveRows()
+            self._reindex(rows_list, first)
+
+            if key is not None and not rows_list:
+                pos = self.group_row(key)
+                self.beginRemoveRows(QModelIndex(), pos, pos)
+                del self._group_keys[pos]
+                del self._top[pos]
+                del self._groups[key]
+                del self._groups_by_id[group.gid]
+                self.endRemoveRows()
+
+    def refresh_slot(self, slot):
+        index = self.index_of(slot)
+        if index.isValid():
+            self.dataChanged.emit(index, index.siblingAtColumn(len(self.headers) - 1))
+
+
+class FileList(QTreeView):
     files_dropped = Signal(list)
+    selection_changed = Signal()
+    hidden_columns_changed = Signal(list)
 
     def __init__(self):
         super().__init__()
@@ -14,26 +423,47 @@ class FileList(QTreeWidget):
         self.setDragDropMode(QAbstractItemView.DropOnly)
         self.setAlternatingRowColors(True)
         self.setRootIsDecorated(False)
-        
-        self.column_names = ["Filename", "Title", "Artist", "Album", "Album Artist", "Year", "Genre", "Disc", "Track"]
-        self.setHeaderLabels(self.column_names)
-        
+        # Every row has the same height, which lets the view skip measuring rows it does not paint
+        self.setUniformRowHeights(True)
+
+        self.column_names = ["Filename", "Title", "Artist", "Album", "Album Artist", "Year", "Genre", "Disc", "Track", "Cover"]
+        self.store = TrackStore()
+        self.track_model = TrackModel(self.store, self.column_names)
+        self.track_model.matches = self._matches_filter
+        self.setModel(self.track_model)
+        self.selectionModel().selectionChanged.connect(lambda *args: self.selection_changed.emit())
+
         header = self.header()
         header.setStretchLastSection(False)
         header.setContextMenuPolicy(Qt.CustomContextMenu)
         header.customContextMenuRequested.connect(self.show_header_menu)
-        
+
         # Set resize modes
         for i in range(len(self.column_names)):
             header.setSectionResizeMode(i, QHeaderView.Interactive)
             header.setMinimumSectionSize(80)
-        
+
         header.setSectionResizeMode(1, QHeaderView.Stretch) # Title stretches
         header.resizeSection(0, 200) # Filename default width
 
-        self.all_files = []
-        self.path_to_item = {} # filepath -> QTreeWidgetItem
+        # Click to sort, a third click goes back to the order tracks were added in
+        header.setSectionsClickable(True)
+        header.setSortIndicatorShown(True)
+        header.setSortIndicatorClearable(True)
+        header.setSortIndicator(-1, Qt.AscendingOrder)
+        header.sortIndicatorChanged.connect(self.sort_by)
+
         self.current_mode = "File"
+        self.filter_text = "" # free text of the query, matched through the search index
+        self.query = Query()
+        self._query_match = None # compiled field terms of the query
+        self._text_matches = None # ascending slots matching filter_text, None until searched or once stale
+        self.cover_filter = None # None shows all, True only tracks with cover art, False only without
+
+    @property
+    def all_files(self):
+        """(path, TrackRecord) pairs of every loaded track, filtered or not."""
+        return self.store.items()
 
     def show_header_menu(self, pos):
         menu = QMenu(self)
@@ -43,10 +473,21 @@ class FileList(QTreeWidget):
             action = QAction(name, self)
             action.setCheckable(True)
             action.setChecked(not self.isColumnHidden(i))
-            action.triggered.connect(lambda checked, col=i: self.setColumnHidden(col, not checked))
+            action.triggered.connect(lambda checked, col=i: self._set_column_visible(col, checked))
             menu.addAction(action)
         menu.exec_(self.header().mapToGlobal(pos))
 
+    def _set_column_visible(self, column, visible):
+        self.setColumnHidden(column, not visible)
+        self.hidden_columns_changed.emit(self.hidden_columns())
+
+    def hidden_columns(self):
+        return [i for i in range(len(self.column_names)) if self.isColumnHidden(i)]
+
+    def set_hidden_columns(self, columns):
+        for i in range(1, len(self.column_names)):
+            self.setColumnHidden(i, i in columns)
+
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls():
             event.acceptProposedAction()
@@ -62,157 +503,281 @@ class FileList(QTreeWidget):
             if os.path.isfile(path):
                 if path.lower().endswith(('.mp3', '.flac', '.ogg', '.m4a', '.wav')):
                     files.append(path)
-        
+
         if files:
             self.files_dropped.emit(files)
             event.acceptProposedAction()
 
     def add_file(self, path):
         try:
-            meta = MetadataHandler(path)
-            self.all_files.append((path, meta))
-            self.refresh_view()
+            meta = TrackRecord.from_file(path)
+            self.append_files([(path, meta)])
         except Exception as e:
             print(f"Error adding file {path}: {e}")
 
     def add_files(self, data):
-        """Accepts either a list of paths or a list of (path, metadata) tuples/lists."""
+        """Accepts either a list of paths or a list of (path, TrackRecord) tuples/lists."""
+        records = []
         for item in data:
             try:
                 if isinstance(item, (list, tuple)) and len(item) == 2:
                     path, meta = item
                 else:
                     path = item
-                    meta = MetadataHandler(path)
-                self.all_files.append((path, meta))
+                    meta = TrackRecord.from_file(path)
+                records.append((path, meta))
             except Exception as e:
                 print(f"Error adding file: {e}")
-        self.refresh_view()
+        self.append_files(records)
+
+    def append_files(self, data):
+        """Appends (path, TrackRecord) pairs to the view without rebuilding existing rows."""
+        if not data:
+            return
+        new_slots = []
+        for path, meta in data:
+            if path in self.store:
+                self._replace(path, meta)
+            else:
+                new_slots.append(self.store.add(path, meta))
+        if self.filter_text and self._text_matches is not None:
+            # New slots are the highest, so the list stays sorted
+            texts = self.store.search_index.texts
+            self._text_matches.extend(slot for slot in new_slots if self.filter_text in texts[slot])
+        self.track_model.insert_slots(new_slots)
+
+    def apply_changes(self, updated, removed):
+        """Applies a batch of outside changes in one pass.
+
+        updated: (path, TrackRecord) pairs for new or modified files
+        removed: paths that no longer exist
+        """
+        keys = {}
+        slots = []
+        for path in removed:
+            slot = self.store.slot_of.get(path)
+            if slot is not None:
+                keys[slot] = self.track_model.group_key(self.store.records[slot])
+                slots.append(slot)
+        self.track_model.remove_slots(slots, keys)
+        for path in removed:
+            self.store.remove(path)
+        if slots:
+            self._text_matches = None
+        self.append_files(updated)
+
+    def _replace(self, path, meta):
+        slot = self.store.slot_of[path]
+        old_key = self.track_model.group_key(self.store.records[slot])
+        was_shown = slot in self.track_model._row_of
+        self.store.update(slot, meta)
+        self._text_matches = None
+        self._refresh_row(slot, old_key, was_shown)
+
+    def _refresh_row(self, slot, old_key, was_shown):
+        """Repaints an updated track, moving its row if its group or filter match changed."""
+        model = self.track_model
+        if was_shown and model.matches(slot) and (
+                not model.grouped or model.group_key(self.store.records[slot]) == old_key) and model.in_order(slot):
+            model.refresh_slot(slot)
+            return
+        if was_shown:
+            model.remove_slots([slot], {slot: old_key})
+        model.insert_slots([slot])
 
     def clear_files(self):
-        self.all_files = []
-        self.path_to_item = {}
-        self.clear()
+        self.store.clear()
+        self._text_matches = None
+        self.track_model.rebuild()
 
     def set_display_mode(self, mode):
         self.current_mode = mode
-        self.refresh_view()
+        self.setRootIsDecorated(mode in GROUP_MODES)
+        self.track_model.set_mode(mode, self._filtered_slots())
 
     def set_filter(self, text):
-        text = text.lower().strip()
-        iterator = QTreeWidgetItemIterator(self)
-        while iterator.value():
-            item = iterator.value()
-            if item.data(0, Qt.UserRole):  # Only filter actual file items
-                filename = item.text(0).lower()
-                title = item.text(1).lower()
-                artist = item.text(2).lower()
-                album = item.text(3).lower()
-                match = (not text or 
-                         text in filename or 
-                         text in title or 
-                         text in artist or 
-                         text in album)
-                item.setHidden(not match)
-            iterator += 1
-
-    def _update_item_columns(self, item, path, meta):
-        """Updates the text of a QTreeWidgetItem in-place."""
-        item.setText(0, os.path.basename(path))
-        item.setText(1, meta.title or "")
-        item.setText(2, meta.artist or "")
-        item.setText(3, meta.album or "")
-        item.setText(4, meta.album_artist or "")
-        item.setText(5, meta.year or "")
-        item.setText(6, meta.genre or "")
-        item.setText(7, meta.disc_number or "")
-        item.setText(8, meta.track_number or "")
-        item.setData(0, Qt.UserRole, path)
-        
-        item.setTextAlignment(5, Qt.AlignCenter)  # Year
-        item.setTextAlignment(7, Qt.AlignCenter)  # Disc
-        item.setTextAlignment(8, Qt.AlignCenter)  # Track
+        """Filters by a query (see parse_query); its free text goes through the search index."""
+        query = parse_query(text.strip())
+        previous = self.filter_text
+        same_terms = query.terms == self.query.terms
+        if query.text == previous and same_terms:
+            return
+        self.query = query
+        self.filter_text = query.text
+        if not same_terms:
+            self._query_match = query.compile(self.store)
+        # Typing more can only drop rows, as can the first letter typed into an empty box
+        narrowing = same_terms and query.text and previous in query.text
+        if narrowing and previous and self._text_matches is not None:
+            # Only the previous matches are checked
+            self._text_matches = self.store.search_index.search(query.text, within=self._text_matches)
+        else:
+            self._text_matches = None
+        slots = self._filtered_slots()
+        if narrowing and len(slots) == len(self.track_model._row_of):
+            # Every shown row still matches, the view is left as it is
+            return
+        self._rebuild(slots)
+
+    def set_cover_filter(self, has_cover):
+        self.cover_filter = has_cover
+        self._rebuild(self._filtered_slots())
+
+    def _rebuild(self, slots, keep_scroll=False):
+        """Rebuilds the rows in the current mode, keeping the groups that were expanded open."""
+        model = self.track_model
+        expanded = []
+        if model.grouped:
+            expanded = [group.key for row, group in enumerate(model._top)
+                        if self.isExpanded(model.index(row, 0))]
+        scroll = self.verticalScrollBar().value()
+        model.rebuild(slots)
+        for key in expanded:
+            if key in model._groups:
+                self.setExpanded(model.createIndex(model.group_row(key), 0, 0), True)
+        if keep_scroll:
+            self.verticalScrollBar().setValue(scroll)
+
+    def sort_by(self, column, order=Qt.AscendingOrder):
+        """Sorts the tracks by column (-1 for the order they were added in), keeping the selection."""
+        model = self.track_model
+        if model.is_sorted(column, order):
+            return
+        selection = self.selectionModel()
+        # Internal id of the parent -> selected rows, tracks are held by slot over the sort.
+        # Read from the ranges, asking for every selected index is far slower.
+        rows = {}
+        for selected in selection.selection():
+            group = model.group_at(selected.parent())
+            top, bottom = selected.top(), selected.bottom() + 1
+            if group is not None:
+                rows.setdefault(group.gid, set()).update(group.slots[top:bottom])
+            elif model.grouped:
+                rows.setdefault(0, set()).update(range(top, bottom))
+            else:
+                rows.setdefault(0, set()).update(model._top[top:bottom])
+        # The selection is the same before and after, nobody is told about the interim
+        selection.blockSignals(True)
+        selection.clearSelection()
+        model.sort_in_place(column, order)
+        restored = QItemSelection()
+        for gid, items in rows.items():
+            if gid or not model.grouped:
+                items = [model._row_of[slot] for slot in items]
+            items = sorted(items)
+            # Consecutive rows as one range, a select all stays a single range
+            start = 0
+            for i in range(1, len(items) + 1):
+                if i == len(items) or items[i] != items[i - 1] + 1:
+                    restored.select(model.createIndex(items[start], 0, gid), model.createIndex(items[i - 1], 0, gid))
+                    start = i
+        selection.select(restored, QItemSelectionModel.Select | QItemSelectionModel.Rows)
+        selection.blockSignals(False)
+        self.viewport().update()
+
+    def _filtered_slots(self):
+        """Slots passing the text and cover filters, in store order."""
+        if self.filter_text:
+            if self._text_matches is None:
+                self._text_matches = self.store.search_index.search(self.filter_text)
+            slots = self._text_matches
+        else:
+            slots = self.store.slots()
+        if self.cover_filter is not None:
+            records = self.store.records
+            slots = [slot for slot in slots if records[slot].has_cover == self.cover_filter]
+        if self._query_match is not None:
+            slots = [slot for slot in slots if self._query_match(slot)]
+        return slots
+
+    def _matches_filter(self, slot):
+        if self.cover_filter is not None and self.store.records[slot].has_cover != self.cover_filter:
+            return False
+        # Filename, title, artist and album, already lowercased by the search index
+        if self.filter_text and self.filter_text not in self.store.search_index.texts[slot]:
+            return False
+        return self._query_match is None or self._query_match(slot)
+
+    def get_record(self, path):
+        """Returns the TrackRecord shown for path, or None if it is not in the list."""
+        return self.store.get(path)
 
     def refresh_view(self):
-        self.clear()
-        self.path_to_item = {}
-        
-        if self.current_mode == "File":
-            self.headerItem().setText(0, "Filename")
-            self.setRootIsDecorated(False)
-            for path, meta in self.all_files:
-                item = QTreeWidgetItem()
-                self._update_item_columns(item, path, meta)
-                self.addTopLevelItem(item)
-                self.path_to_item[path] = item
-                
-        elif self.current_mode in ["Album", "Artist", "Album Artist"]:
-            self.headerItem().setText(0, self.current_mode)
-            self.setRootIsDecorated(True)
-            groups = {}
-            
-            for path, meta in self.all_files:
-                key = "Unknown"
-                if self.current_mode == "Album":
-                    key = meta.album or "Unknown Album"
-                elif self.current_mode == "Artist":
-                    key = meta.artist or "Unknown Artist"
-                elif self.current_mode == "Album Artist":
-                    key = meta.album_artist or meta.artist or "Unknown Artist"
-                
-                if key not in groups:
-                    groups[key] = []
-                groups[key].append((path, meta))
-            
-            for key in sorted(groups.keys()):
-                group_item = QTreeWidgetItem([key])
-                group_item.setExpanded(True)
-                self.addTopLevelItem(group_item)
-                
-                for path, meta in groups[key]:
-                    item = QTreeWidgetItem()
-                    self._update_item_columns(item, path, meta)
-                    group_item.addChild(item)
-                    self.path_to_item[path] = item
+        self._rebuild(self._filtered_slots(), keep_scroll=True)
+
+    def selected_files(self):
+        """Paths of the selected tracks; a selected group stands for all of its tracks."""
+        files = []
+        for index in self.selectionModel().selectedRows(0):
+            group = self.track_model.group_at(index)
+            if group is None:
+                files.append(self.store.paths[self.track_model.slot_at(index)])
+            else:
+                files.extend(self.store.paths[slot] for slot in group.slots)
+        return list(set(files)) # Unique
+
+    def visible_files(self):
+        """Paths of every track that passes the current filter."""
+        return [self.store.paths[slot] for slot in self.track_model.visible_slots()]
+
+    def select_all_visible(self):
+        self.clearSelection()
+        if not self.track_model.rowCount():
+            return False
+        self.selectAll()
+        return True
+
+    def select_file(self, path):
+        """Makes path the only selected track; returns False if it is not shown."""
+        slot = self.store.slot_of.get(path)
+        index = self.track_model.index_of(slot) if slot is not None else QModelIndex()
+        self.clearSelection()
+        if not index.isValid():
+            return False
+        self.setCurrentIndex(index)
+        self.selectionModel().select(index, QItemSelectionModel.Select | QItemSelectionModel.Rows)
+        return True
+
+    def neighbours(self, path, count=1):
+        """Paths of up to count tracks shown above and below path, nearest first."""
+        slot = self.store.slot_of.get(path)
+        start = self.track_model.index_of(slot) if slot is not None else QModelIndex()
+        if not start.isValid():
+            return []
+        paths = []
+        for step in (self.indexAbove, self.indexBelow):
+            index = start
+            found = []
+            # A group row or two may sit in between, collapsed groups are not searched
+            for _ in range(count + 2):
+                index = step(index)
+                if not index.isValid():
+                    break
+                neighbour = self.track_model.slot_at(index)
+                if neighbour is not None:
+                    found.append(self.store.paths[neighbour])
+                    if len(found) == count:
+                        break
+            paths.extend(found)
+        return paths
 
     def update_file(self, path):
-        # Update internal data
-        for i, (fpath, meta) in enumerate(self.all_files):
-            if fpath == path:
-                try:
-                    new_meta = MetadataHandler(path)
-                    self.all_files[i] = (path, new_meta)
-                    
-                    # Update UI in-place if possible
-                    if path in self.path_to_item:
-                        item = self.path_to_item[path]
-                        self._update_item_columns(item, path, new_meta)
-                        
-                        # If in grouped mode, we might need a full refresh if the grouping key changed
-                        # but for simple tag updates, in-place is fine for now.
-                        # MainWindow will trigger a full refresh if needed.
-                    else:
-                        self.refresh_view()
-                except Exception as e:
-                    print(f"Error updating file {path}: {e}")
-                break
+        if path not in self.store:
+            return
+        try:
+            self._replace(path, TrackRecord.from_file(path))
+        except Exception as e:
+            print(f"Error updating file {path}: {e}")
 
     def rename_file(self, old_path, new_path):
-        # Update internal data
-        for i, (fpath, meta) in enumerate(self.all_files):
-            if fpath == old_path:
-                try:
-                    new_meta = MetadataHandler(new_path)
-                    self.all_files[i] = (new_path, new_meta)
-                    
-                    # Update UI in-place
-                    if old_path in self.path_to_item:
-                        item = self.path_to_item[old_path]
-                        del self.path_to_item[old_path]
-                        self._update_item_columns(item, new_path, new_meta)
-                        self.path_to_item[new_path] = item
-                    else:
-                        self.refresh_view()
-                except Exception as e:
-                    print(f"Error loading renamed file {new_path}: {e}")
-                break
+        slot = self.store.slot_of.get(old_path)
+        if slot is None:
+            return
+        # A rename leaves the file's contents alone, so the record is kept instead of re-reading the file
+        record = self.store.records[slot]
+        old_key = self.track_model.group_key(record)
+        was_shown = slot in self.track_model._row_of
+        record.path = new_path
+        self.store.rename(old_path, new_path, record)
+        self._text_matches = None
+        self._refresh_row(slot, old_key, was_shown)
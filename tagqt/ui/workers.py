@@ -1,24 +1,68 @@
 from PySide6.QtCore import QObject, Signal
-from tagqt.core.tags import MetadataHandler
 import os
 import time
 import threading
 
-class LyricsWorker(QObject):
+class BatchWorker(QObject):
+    """Base of the per-file batch workers.
+
+    Results and progress are collected by report() and set_progress() and
+    emitted together at most every FLUSH_INTERVAL seconds, so a fast batch
+    does not queue a UI update per file. Nothing is emitted while the worker
+    blocks, so call flush() before a slow call and before finished.
+    """
     progress = Signal(int, int)
-    result = Signal(str, str, str)
+    results = Signal(list) # [(path, status, message)]
     finished = Signal()
     log = Signal(str)
 
-    def __init__(self, files, lyrics_fetcher):
+    FLUSH_INTERVAL = 0.1
+
+    def __init__(self):
         super().__init__()
-        self.files = files
-        self.lyrics_fetcher = lyrics_fetcher
         self._stop_event = threading.Event()
+        self._results = []
+        self._progress = None
+        self._last_flush = 0.0
 
     def stop(self):
         self._stop_event.set()
 
+    def report(self, path, status, message):
+        self._results.append((path, status, message))
+        self._flush_if_due()
+
+    def set_progress(self, current, total):
+        self._progress = (current, total)
+        self._flush_if_due()
+
+    def _flush_if_due(self):
+        if time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """Emits the buffered results and the latest progress now."""
+        self._last_flush = time.monotonic()
+        if self._results:
+            results, self._results = self._results, []
+            self.results.emit(results)
+        if self._progress is not None:
+            progress, self._progress = self._progress, None
+            self.progress.emit(*progress)
+
+class LyricsWorker(BatchWorker):
+    """Fetches lyrics for files, several lookups at a time.
+
+    Lookups run ahead on a small thread pool (concurrency), while files are
+    written and reported one by one in their original order.
+    """
+
+    def __init__(self, files, lyrics_fetcher, concurrency=4):
+        super().__init__()
+        self.files = files
+        self.lyrics_fetcher = lyrics_fetcher
+        self.concurrency = max(1, concurrency)
+
     def _is_synced(self, lyrics):
         if not lyrics:
             return False
@@ -50,89 +94,109 @@ class LyricsWorker(QObject):
         
         return None, False
 
+    def _lookup(self, f):
+        """Reads f and finds lyrics for it unless it has synced ones; runs on the pool, writes nothing."""
+        from tagqt.core.tags import MetadataHandler
+        md = MetadataHandler(f)
+        existing_lyrics = md.lyrics
+        if existing_lyrics and self._is_synced(existing_lyrics):
+            return md, existing_lyrics, True, None, False
+        duration = md.duration
+        candidates = self.lyrics_fetcher.search_lyrics(md.artist, md.title, md.album, duration)
+        best, is_synced = self._find_best_match(candidates, duration)
+        return md, existing_lyrics, False, best, is_synced
+
+    def _apply(self, f, md, existing_lyrics, existing_is_synced, best, is_synced):
+        base_path = os.path.splitext(f)[0]
+        lrc_path = base_path + ".lrc"
+        
+        if existing_lyrics and existing_is_synced:
+            if not os.path.exists(lrc_path):
+                md.save_lyrics_file()
+                self.report(f, "Skipped", "Synced lyrics exist, created .lrc")
+            else:
+                self.report(f, "Skipped", "Synced lyrics and .lrc exist")
+            return
+        
+        if best and is_synced:
+            lyrics = best.get("syncedLyrics")
+            md.lyrics = lyrics
+            md.save()
+            
+            if existing_lyrics:
+                self.report(f, "Updated", "Replaced with synced lyrics")
+            else:
+                self.report(f, "Found", "Synced lyrics downloaded")
+        elif best and not is_synced:
+            if existing_lyrics:
+                if not os.path.exists(lrc_path):
+                    md.save_lyrics_file()
+                    self.report(f, "Skipped", "No synced available, kept existing, created .lrc")
+                else:
+                    self.report(f, "Skipped", "No synced available, kept existing")
+            else:
+                md.lyrics = best.get("plainLyrics")
+                md.save()
+                self.report(f, "Found", "Plain lyrics (no synced available)")
+        else:
+            if existing_lyrics:
+                if not os.path.exists(lrc_path):
+                    md.save_lyrics_file()
+                    self.report(f, "Skipped", "No matches, kept existing, created .lrc")
+                else:
+                    self.report(f, "Skipped", "No matches found, kept existing")
+            else:
+                self.report(f, "Missing", "No matches found")
+
     def run(self):
+        from collections import deque
+        from concurrent.futures import ThreadPoolExecutor, wait
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="LyricsLookup")
         try:
             start_time = time.time()
-            self.log.emit(f"[DEBUG] Starting batch lyrics fetch for {len(self.files)} files")
+            total = len(self.files)
+            self.log.emit(f"[DEBUG] Starting batch lyrics fetch for {total} files with {self.concurrency} lookups at a time")
             
+            pending = deque()
+            queued = 0
             for i, f in enumerate(self.files):
                 if self._stop_event.is_set():
                     break
-
-                self.progress.emit(i, len(self.files))
-                self.result.emit(f, "Checking", "Checking if lyrics is synced")
+                # Keep the pool busy a few files ahead of the one being written
+                while queued < total and queued < i + self.concurrency * 2:
+                    pending.append(executor.submit(self._lookup, self.files[queued]))
+                    queued += 1
+
+                self.set_progress(i, total)
+                self.report(f, "Checking", "Checking if lyrics is synced")
+                future = pending.popleft()
+                while not future.done() and not self._stop_event.is_set():
+                    wait([future], timeout=self.FLUSH_INTERVAL)
+                    # Show what is buffered while the lookup is still running
+                    self._flush_if_due()
+                if self._stop_event.is_set():
+                    break
                 
                 try:
-                    md = MetadataHandler(f)
-                    base_path = os.path.splitext(f)[0]
-                    lrc_path = base_path + ".lrc"
-                    
-                    existing_lyrics = md.lyrics
-                    existing_is_synced = self._is_synced(existing_lyrics)
-                    
-                    if existing_lyrics and existing_is_synced:
-                        if not os.path.exists(lrc_path):
-                            md.save_lyrics_file()
-                            self.result.emit(f, "Skipped", "Synced lyrics exist, created .lrc")
-                        else:
-                            self.result.emit(f, "Skipped", "Synced lyrics and .lrc exist")
-                        continue
-                        
-                    candidates = self.lyrics_fetcher.search_lyrics(md.artist, md.title, md.album)
-                    best, is_synced = self._find_best_match(candidates, md.duration)
-                    
-                    if best and is_synced:
-                        lyrics = best.get("syncedLyrics")
-                        md.lyrics = lyrics
-                        md.save()
-                        
-                        if existing_lyrics:
-                            self.result.emit(f, "Updated", "Replaced with synced lyrics")
-                        else:
-                            self.result.emit(f, "Found", "Synced lyrics downloaded")
-                    elif best and not is_synced:
-                        if existing_lyrics:
-                            if not os.path.exists(lrc_path):
-                                md.save_lyrics_file()
-                                self.result.emit(f, "Skipped", "No synced available, kept existing, created .lrc")
-                            else:
-                                self.result.emit(f, "Skipped", "No synced available, kept existing")
-                        else:
-                            md.lyrics = best.get("plainLyrics")
-                            md.save()
-                            self.result.emit(f, "Found", "Plain lyrics (no synced available)")
-                    else:
-                        if existing_lyrics:
-                            if not os.path.exists(lrc_path):
-                                md.save_lyrics_file()
-                                self.result.emit(f, "Skipped", "No matches, kept existing, created .lrc")
-                            else:
-                                self.result.emit(f, "Skipped", "No matches found, kept existing")
-                        else:
-                            self.result.emit(f, "Missing", "No matches found")
+                    self._apply(f, *future.result())
                 except Exception as e:
                     self.log.emit(f"[DEBUG] Error fetching lyrics for {f}: {e}")
-                    self.result.emit(f, "Error", str(e))
+                    self.report(f, "Error", str(e))
                     
             self.log.emit(f"[DEBUG] Batch lyrics finished in {time.time() - start_time:.2f}s")
-            self.progress.emit(len(self.files), len(self.files))
+            self.set_progress(len(self.files), len(self.files))
         finally:
+            # Lookups still running only read, they are left to finish on their own
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.flush()
             self.finished.emit()
 
-class AutoTagWorker(QObject):
-    progress = Signal(int, int)
-    result = Signal(str, str, str)
-    finished = Signal()
-    log = Signal(str)
+class AutoTagWorker(BatchWorker):
 
     def __init__(self, files, skip_existing=True):
         super().__init__()
         self.files = files
         self.skip_existing = skip_existing
-        self._stop_event = threading.Event()
-
-    def stop(self):
-        self._stop_event.set()
 
     @staticmethod
     def is_generic(val):
@@ -167,6 +231,7 @@ class AutoTagWorker(QObject):
 
     def run(self):
         try:
+            from tagqt.core.tags import MetadataHandler
             from tagqt.core.musicbrainz import MusicBrainzClient
             
             groups = {}
@@ -196,31 +261,33 @@ class AutoTagWorker(QObject):
                             groups[key] = []
                         groups[key].append(f)
                     elif not artist or not album:
-                        self.result.emit(f, "Skipped", "Needs artist and album tags to lookup")
+                        self.report(f, "Skipped", "Needs artist and album tags to lookup")
                         skipped_early += 1
                     elif not needs_tagging:
-                        self.result.emit(f, "Skipped", "All tags already present")
+                        self.report(f, "Skipped", "All tags already present")
                         skipped_early += 1
                 except Exception as e:
-                    self.result.emit(f, "Error", str(e))
+                    self.report(f, "Error", str(e))
                     skipped_early += 1
 
             processed_count = skipped_early
             total_files = len(self.files)
-            self.progress.emit(processed_count, total_files)
+            self.set_progress(processed_count, total_files)
             
             for (artist, album), group_files in groups.items():
                 if self._stop_event.is_set():
                     break
                 
                 self.log.emit(f"Looking up: {artist} - {album}")
+                # MusicBrainz lookups are rate limited and can take seconds, show the results so far first
+                self.flush()
                 release = MusicBrainzClient.search_release(artist, album)
                 
                 if not release:
                     for f in group_files:
-                        self.result.emit(f, "Not Found", f"'{album}' by '{artist}' not in MusicBrainz")
+                        self.report(f, "Not Found", f"'{album}' by '{artist}' not in MusicBrainz")
                         processed_count += 1
-                        self.progress.emit(processed_count, total_files)
+                        self.set_progress(processed_count, total_files)
                     continue
                     
                 release_id = release.get("id")
@@ -228,14 +295,17 @@ class AutoTagWorker(QObject):
                 album_year = release.get("year")
                 album_genres = release.get("genres", [])
                 
-                release_details = MusicBrainzClient.lookup_release(release_id, None) if release_id else None
+                # One download per album, every track is matched against it locally
+                self.flush()
+                release_data = MusicBrainzClient.fetch_release(release_id) if release_id else None
+                release_details = MusicBrainzClient.match_track(release_data)
                 disc_count = release_details.get("disc_count", 1) if release_details else 1
                 
                 for f in group_files:
                     if self._stop_event.is_set():
                         break
                     processed_count += 1
-                    self.progress.emit(processed_count, total_files)
+                    self.set_progress(processed_count, total_files)
                     
                     try:
                         md = MetadataHandler(f)
@@ -253,13 +323,13 @@ class AutoTagWorker(QObject):
                             title_to_match = self.extract_title_from_filename(f)
                             match_source = "filename"
                         
-                        track_details = MusicBrainzClient.lookup_release(release_id, title_to_match)
+                        track_details = MusicBrainzClient.match_track(release_data, title_to_match)
                         track_matched = track_details and track_details.get("track_position")
                         
                         if not track_matched and match_source == "title":
                             fallback_title = self.extract_title_from_filename(f)
                             if fallback_title != title_to_match:
-                                track_details = MusicBrainzClient.lookup_release(release_id, fallback_title)
+                                track_details = MusicBrainzClient.match_track(release_data, fallback_title)
                                 if track_details and track_details.get("track_position"):
                                     track_matched = True
                         
@@ -301,74 +371,182 @@ class AutoTagWorker(QObject):
                         
                         if changes:
                             md.save()
-                            self.result.emit(f, "Updated", f"Added: {', '.join(changes)}")
+                            self.report(f, "Updated", f"Added: {', '.join(changes)}")
                         elif not track_matched:
-                            self.result.emit(f, "Not Matched", "Track not found in release")
+                            self.report(f, "Not Matched", "Track not found in release")
                         else:
-                            self.result.emit(f, "Skipped", "All tags already present")
+                            self.report(f, "Skipped", "All tags already present")
                             
                     except Exception as e:
-                        self.result.emit(f, "Error", str(e))
+                        self.report(f, "Error", str(e))
             
-            self.progress.emit(total_files, total_files)
+            self.set_progress(total_files, total_files)
         finally:
+            self.flush()
             self.finished.emit()
 
 class FolderLoaderWorker(QObject):
     progress = Signal(int, int)
-    finished = Signal(list, str)
+    root_progress = Signal(str, int, int) # root, files loaded, files found so far
+    chunk = Signal(list)
+    finished = Signal(int, list)
     log = Signal(str)
 
-    def __init__(self, folder_path):
+    CHUNK_INTERVAL = 0.25 # seconds between chunk signals
+    CHUNK_SIZE = 1000 # max tracks per chunk, keeps each UI append short
+
+    def __init__(self, roots, workers=1):
+        """roots: library folders to load; they are scanned concurrently into one stream of chunks."""
         super().__init__()
-        self.folder_path = folder_path
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.workers = workers
         self._stop_event = threading.Event()
+        self._pending = []
+        self._last_flush = 0.0
+        self._loaded = 0
+        self._found = dict.fromkeys(self.roots, 0)
+        self._done = dict.fromkeys(self.roots, 0)
+        # The scan runs on parse_tracks' feeder thread, results and counts are shared with it
+        self._lock = threading.RLock()
 
     def stop(self):
         self._stop_event.set()
 
+    def _add_result(self, path, record):
+        with self._lock:
+            self._pending.append((path, record))
+            if len(self._pending) >= self.CHUNK_SIZE or time.monotonic() - self._last_flush >= self.CHUNK_INTERVAL:
+                self._flush()
+
+    def _flush(self):
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if self._pending:
+                self._loaded += len(self._pending)
+                self.chunk.emit(self._pending)
+                self._pending = []
+            for root in self.roots:
+                self.root_progress.emit(root, self._done[root], self._found[root])
+
     def run(self):
-        finished_emitted = False
+        index = None
         try:
-            paths = []
-            for root, dirs, filenames in os.walk(self.folder_path):
-                if self._stop_event.is_set():
-                    break
-                for filename in filenames:
-                    if filename.lower().endswith(('.mp3', '.flac', '.ogg', '.m4a', '.wav')):
-                        paths.append(os.path.join(root, filename))
+            from tagqt.core.library import LibraryIndex, file_key, parse_tracks
+            from tagqt.core.scanner import scan_audio_roots
+
+            index = LibraryIndex()
+            known = {}
+            for root in self.roots:
+                known.update(index.get_entries(root))
+            self._last_flush = time.monotonic()
+
+            seen = set()
+            keys = {}
+            owners = {}
+
+            def changed_paths():
+                # Unchanged files come straight from the index, new or changed
+                # ones go on to the parser while the scan is still running
+                for root, path, st in scan_audio_roots(self.roots, self._stop_event):
+                    key = file_key(st)
+                    with self._lock:
+                        seen.add(path)
+                        self._found[root] += 1
+                        cached = known.get(path)
+                        if cached and cached[0] == key:
+                            self._done[root] += 1
+                            self._add_result(path, cached[1])
+                            continue
+                        keys[path] = key
+                        owners[path] = root
+                    yield path
+
+            entries = []
+            done = 0
+            for batch in parse_tracks(changed_paths(), self.workers, self._stop_event):
+                with self._lock:
+                    for path, record, error in batch:
+                        self._done[owners[path]] += 1
+                        if record is None:
+                            self.log.emit(f"Error reading {path}: {error}")
+                        else:
+                            entries.append((record, keys[path]))
+                            self._add_result(path, record)
+                    total = len(keys)
+                done += len(batch)
+                
+                if len(entries) >= 500:
+                    index.store(entries)
+                    entries = []
+                
+                # The total grows while the scan is still discovering files
+                self.progress.emit(done, total)
+            self._flush()
+            self.log.emit(f"{len(seen)} files found, {len(keys)} new or changed")
+            
+            # Keep whatever was parsed before a cancel, it is still valid
+            index.store(entries)
             
             if self._stop_event.is_set():
                 return
 
-            results = []
-            total = len(paths)
-            for i, path in enumerate(paths):
-                if self._stop_event.is_set():
-                    break
+            index.remove([path for path in known if path not in seen])
+        finally:
+            if index:
+                index.close()
+            self._flush()
+            self.finished.emit(self._loaded, self.roots)
+
+class FolderWatchWorker(QObject):
+    changed = Signal(list, list)
+    overflow = Signal(str)
+    log = Signal(str)
+
+    def __init__(self, folder_path):
+        super().__init__()
+        from tagqt.core.watcher import FolderWatcher
+        self.folder_path = folder_path
+        self._watcher = FolderWatcher(folder_path, self._on_changes, self._on_overflow, self.log.emit)
+
+    def start(self):
+        self._watcher.start()
+
+    def stop(self):
+        self._watcher.stop()
+
+    def _on_overflow(self):
+        self.overflow.emit(self.folder_path)
+
+    def _on_changes(self, changed, removed, removed_dirs):
+        # Called on the watcher thread with one coalesced batch of events
+        from tagqt.core.library import LibraryIndex, file_key, read_tracks
+        index = LibraryIndex()
+        try:
+            removed = set(removed)
+            for directory in removed_dirs:
+                removed.update(index.get_entries(directory))
+            
+            records = []
+            entries = []
+            for path, record, error in read_tracks(changed):
+                if record is None:
+                    self.log.emit(f"Error reading {path}: {error}")
+                    continue
                 try:
-                    md = MetadataHandler(path)
-                    results.append((path, md))
-                except Exception as e:
-                    self.log.emit(f"Error reading {path}: {e}")
-                
-                if i % 10 == 0: # Update progress every 10 files to avoid signal overhead
-                    self.progress.emit(i, total)
+                    key = file_key(os.stat(path))
+                except OSError:
+                    removed.add(path)
+                    continue
+                records.append((path, record))
+                entries.append((record, key))
             
-            if self._stop_event.is_set():
-                return
-
-            self.finished.emit(results, self.folder_path)
-            finished_emitted = True
+            index.store(entries)
+            index.remove(removed)
         finally:
-            if not finished_emitted:
-                self.finished.emit([], self.folder_path)
+            index.close()
+        self.changed.emit(records, list(removed))
 
-class RenameWorker(QObject):
-    progress = Signal(int, int)
-    result = Signal(str, str, str)
-    finished = Signal()
-    log = Signal(str)
+class RenameWorker(BatchWorker):
 
     def __init__(self, rename_data):
         """
@@ -376,10 +554,6 @@ class RenameWorker(QObject):
         """
         super().__init__()
         self.rename_data = rename_data
-        self._stop_event = threading.Event()
-
-    def stop(self):
-        self._stop_event.set()
 
     def run(self):
         try:
@@ -388,7 +562,7 @@ class RenameWorker(QObject):
                 if self._stop_event.is_set():
                     break
                 
-                self.progress.emit(i, total)
+                self.set_progress(i, total)
                 
                 try:
                     dir_path = os.path.dirname(old_path)
@@ -396,46 +570,42 @@ class RenameWorker(QObject):
                     
                     if old_path != new_path:
                         if os.path.exists(new_path):
-                            self.result.emit(old_path, "Error", f"File already exists: {new_name}")
+                            self.report(old_path, "Error", f"File already exists: {new_name}")
                         else:
                             os.rename(old_path, new_path)
-                            self.result.emit(old_path, "Success", f"Renamed to {new_name}")
+                            self.report(old_path, "Success", f"Renamed to {new_name}")
                     else:
-                        self.result.emit(old_path, "Skipped", "Name unchanged")
+                        self.report(old_path, "Skipped", "Name unchanged")
                 except Exception as e:
-                    self.result.emit(old_path, "Error", str(e))
+                    self.report(old_path, "Error", str(e))
                     
-            self.progress.emit(total, total)
+            self.set_progress(total, total)
         finally:
+            self.flush()
             self.finished.emit()
 
-class CoverFetchWorker(QObject):
-    progress = Signal(int, int)
-    result = Signal(str, str, str)
-    finished = Signal()
-    log = Signal(str)
+class CoverFetchWorker(BatchWorker):
 
     def __init__(self, files, cover_manager):
         super().__init__()
         self.files = files
         self.cover_manager = cover_manager
-        self._stop_event = threading.Event()
-
-    def stop(self):
-        self._stop_event.set()
 
     def run(self):
         try:
+            from tagqt.core.tags import MetadataHandler
             total = len(self.files)
             processed_folders = set()
             
             for i, f in enumerate(self.files):
                 if self._stop_event.is_set(): break
-                self.progress.emit(i, total)
+                self.set_progress(i, total)
                 
                 try:
                     md = MetadataHandler(f)
                         
+                    # Searching and downloading block for a while, show the previous file first
+                    self.flush()
                     candidates = self.cover_manager.search_cover_candidates(md.artist, md.album)
                     if candidates:
                         url = candidates[0]["url"]
@@ -449,38 +619,32 @@ class CoverFetchWorker(QObject):
                                 md.save_cover_file(data, overwrite=True)
                                 processed_folders.add(folder)
                                 
-                            self.result.emit(f, "Found", "Cover downloaded")
+                            self.report(f, "Found", "Cover downloaded")
                         else:
-                            self.result.emit(f, "Missing", "Download failed")
+                            self.report(f, "Missing", "Download failed")
                     else:
-                        self.result.emit(f, "Missing", "No candidates found")
+                        self.report(f, "Missing", "No candidates found")
                 except Exception as e:
-                    self.result.emit(f, "Error", str(e))
+                    self.report(f, "Error", str(e))
                     
-            self.progress.emit(total, total)
+            self.set_progress(total, total)
         finally:
+            self.flush()
             self.finished.emit()
 
-class CoverResizeWorker(QObject):
-    progress = Signal(int, int)
-    result = Signal(str, str, str)
-    finished = Signal()
-    log = Signal(str)
+class CoverResizeWorker(BatchWorker):
 
     def __init__(self, files):
         super().__init__()
         self.files = files
-        self._stop_event = threading.Event()
-
-    def stop(self):
-        self._stop_event.set()
 
     def run(self):
         try:
+            from tagqt.core.tags import MetadataHandler
             total = len(self.files)
             for i, f in enumerate(self.files):
                 if self._stop_event.is_set(): break
-                self.progress.emit(i, total)
+                self.set_progress(i, total)
                 
                 try:
                     md = MetadataHandler(f)
@@ -488,37 +652,31 @@ class CoverResizeWorker(QObject):
                     if cover:
                         md.set_cover(cover, max_size=500)
                         md.save()
-                        self.result.emit(f, "Success", "Cover resized")
+                        self.report(f, "Success", "Cover resized")
                     else:
-                        self.result.emit(f, "Skipped", "No cover found")
+                        self.report(f, "Skipped", "No cover found")
                 except Exception as e:
-                    self.result.emit(f, "Error", str(e))
+                    self.report(f, "Error", str(e))
                     
-            self.progress.emit(total, total)
+            self.set_progress(total, total)
         finally:
+            self.flush()
             self.finished.emit()
 
-class RomanizeWorker(QObject):
-    progress = Signal(int, int)
-    result = Signal(str, str, str)
-    finished = Signal()
-    log = Signal(str)
+class RomanizeWorker(BatchWorker):
 
     def __init__(self, files, romanizer):
         super().__init__()
         self.files = files
         self.romanizer = romanizer
-        self._stop_event = threading.Event()
-
-    def stop(self):
-        self._stop_event.set()
 
     def run(self):
         try:
+            from tagqt.core.tags import MetadataHandler
             total = len(self.files)
             for i, f in enumerate(self.files):
                 if self._stop_event.is_set(): break
-                self.progress.emit(i, total)
+                self.set_progress(i, total)
                 
                 try:
                     md = MetadataHandler(f)
@@ -528,42 +686,36 @@ class RomanizeWorker(QObject):
                         if new_val != val:
                             md.lyrics = new_val
                             md.save()
-                            self.result.emit(f, "Success", "Lyrics romanized")
+                            self.report(f, "Success", "Lyrics romanized")
                         else:
-                            self.result.emit(f, "Skipped", "No change needed")
+                            self.report(f, "Skipped", "No change needed")
                     else:
-                        self.result.emit(f, "Skipped", "No lyrics found")
+                        self.report(f, "Skipped", "No lyrics found")
                 except Exception as e:
-                    self.result.emit(f, "Error", str(e))
+                    self.report(f, "Error", str(e))
                     
-            self.progress.emit(total, total)
+            self.set_progress(total, total)
         finally:
+            self.flush()
             self.finished.emit()
 
-class CaseConvertWorker(QObject):
-    progress = Signal(int, int)
-    result = Signal(str, str, str)
-    finished = Signal()
-    log = Signal(str)
+class CaseConvertWorker(BatchWorker):
 
     def __init__(self, files, mode):
         super().__init__()
         self.files = files
         self.mode = mode
-        self._stop_event = threading.Event()
-
-    def stop(self):
-        self._stop_event.set()
 
     def run(self):
         try:
+            from tagqt.core.tags import MetadataHandler
             from tagqt.core.case import CaseConverter
             total = len(self.files)
             fields = ['title', 'artist', 'album', 'genre', 'album_artist', 'comment', 'publisher']
             
             for i, f in enumerate(self.files):
                 if self._stop_event.is_set(): break
-                self.progress.emit(i, total)
+                self.set_progress(i, total)
                 
                 try:
                     md = MetadataHandler(f)
@@ -582,29 +734,22 @@ class CaseConvertWorker(QObject):
                                 changed = True
                     if changed:
                         md.save()
-                        self.result.emit(f, "Success", "Case converted")
+                        self.report(f, "Success", "Case converted")
                     else:
-                        self.result.emit(f, "Skipped", "No change")
+                        self.report(f, "Skipped", "No change")
                 except Exception as e:
-                    self.result.emit(f, "Error", str(e))
+                    self.report(f, "Error", str(e))
                     
-            self.progress.emit(total, total)
+            self.set_progress(total, total)
         finally:
+            self.flush()
             self.finished.emit()
 
-class FlacReencodeWorker(QObject):
-    progress = Signal(int, int)
-    result = Signal(str, str, str)
-    finished = Signal()
-    log = Signal(str)
+class FlacReencodeWorker(BatchWorker):
 
     def __init__(self, files):
         super().__init__()
         self.files = files
-        self._stop_event = threading.Event()
-
-    def stop(self):
-        self._stop_event.set()
 
     def run(self):
         try:
@@ -612,42 +757,38 @@ class FlacReencodeWorker(QObject):
             total = len(self.files)
             for i, f in enumerate(self.files):
                 if self._stop_event.is_set(): break
-                self.progress.emit(i, total)
+                self.set_progress(i, total)
+                # Re-encoding takes seconds per file
+                self.flush()
                 
                 success, error = FlacEncoder.reencode_flac(f)
                 if success:
-                    self.result.emit(f, "Success", "Re-encoded to 24-bit 48kHz")
+                    self.report(f, "Success", "Re-encoded to 24-bit 48kHz")
                 else:
-                    self.result.emit(f, "Error", error)
+                    self.report(f, "Error", error)
                     
-            self.progress.emit(total, total)
+            self.set_progress(total, total)
         finally:
+            self.flush()
             self.finished.emit()
 
-class CsvImportWorker(QObject):
-    progress = Signal(int, int)
-    result = Signal(str, str, str)
-    finished = Signal()
-    log = Signal(str)
+class CsvImportWorker(BatchWorker):
 
     def __init__(self, rows):
         super().__init__()
         self.rows = rows
-        self._stop_event = threading.Event()
-
-    def stop(self):
-        self._stop_event.set()
 
     def run(self):
         try:
+            from tagqt.core.tags import MetadataHandler
             total = len(self.rows)
             for i, row in enumerate(self.rows):
                 if self._stop_event.is_set(): break
-                self.progress.emit(i, total)
+                self.set_progress(i, total)
                 
                 fpath = row.get('filepath')
                 if not fpath or not os.path.exists(fpath):
-                    self.result.emit(fpath or "Unknown", "Error", "File not found")
+                    self.report(fpath or "Unknown", "Error", "File not found")
                     continue
                 try:
                     md = MetadataHandler(fpath)
@@ -659,47 +800,77 @@ class CsvImportWorker(QObject):
                             changed = True
                     if changed:
                         md.save()
-                        self.result.emit(fpath, "Success", "Metadata imported")
+                        self.report(fpath, "Success", "Metadata imported")
                     else:
-                        self.result.emit(fpath, "Skipped", "No changes in CSV")
+                        self.report(fpath, "Skipped", "No changes in CSV")
                 except Exception as e:
-                    self.result.emit(fpath, "Error", str(e))
+                    self.report(fpath, "Error", str(e))
                     
-            self.progress.emit(total, total)
+            self.set_progress(total, total)
         finally:
+            self.flush()
             self.finished.emit()
 
-class SaveWorker(QObject):
-    progress = Signal(int, int)
-    result = Signal(str, str, str)
-    finished = Signal()
-    log = Signal(str)
+class CsvExportWorker(BatchWorker):
+    """Writes the tags of (path, TrackRecord) pairs to a CSV file, reading each file's lyrics on the way."""
+
+    def __init__(self, files, filepath):
+        super().__init__()
+        self.files = files
+        self.filepath = filepath
+
+    def _rows(self):
+        from tagqt.core.csv_io import metadata_row
+        total = len(self.files)
+        for i, (path, record) in enumerate(self.files):
+            if self._stop_event.is_set():
+                break
+            self.set_progress(i, total)
+            try:
+                lyrics = record.open().lyrics
+            except Exception as e:
+                self.report(path, "Error", f"Lyrics not exported: {e}")
+                lyrics = ""
+            else:
+                self.report(path, "Exported", "")
+            yield metadata_row(path, record, lyrics)
+        self.set_progress(total, total)
+
+    def run(self):
+        try:
+            from tagqt.core.csv_io import export_metadata_to_csv
+            success, error = export_metadata_to_csv(self._rows(), self.filepath)
+            if not success:
+                self.report(self.filepath, "Error", error)
+        finally:
+            self.flush()
+            self.finished.emit()
+
+class SaveWorker(BatchWorker):
 
     def __init__(self, files, changes):
         super().__init__()
         self.files = files
         self.changes = changes
-        self._stop_event = threading.Event()
-
-    def stop(self):
-        self._stop_event.set()
 
     def run(self):
         try:
+            from tagqt.core.tags import MetadataHandler
             total = len(self.files)
             for i, f in enumerate(self.files):
                 if self._stop_event.is_set(): break
-                self.progress.emit(i, total)
+                self.set_progress(i, total)
                 
                 try:
                     md = MetadataHandler(f)
                     for key, value in self.changes.items():
                         setattr(md, key, value)
                     md.save()
-                    self.result.emit(f, "Success", "Metadata updated")
+                    self.report(f, "Success", "Metadata updated")
                 except Exception as e:
-                    self.result.emit(f, "Error", str(e))
+                    self.report(f, "Error", str(e))
                     
-            self.progress.emit(total, total)
+            self.set_progress(total, total)
         finally:
+            self.flush()
             self.finished.emit()
@@ -0,0 +1,209 @@
+"""Performance benchmarks with budgets.
+
+    python -m tagqt.utils.bench startup [--runs N] [--import-budget MS] [--paint-budget MS] [--record FILE]
+    python -m tagqt.utils.bench rename [--tracks N] [--max-growth X] [--record FILE]
+
+Exits with status 1 when a measurement is over its budget, so it can gate
+a release or a CI job.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Subsystems that must stay out of startup; they are imported on first use
+DEFERRED_MODULES = ('requests', 'urllib3', 'PIL', 'mutagen', 'musicbrainzngs', 'koroman')
+
+STARTUP_IMPORT_BUDGET_MS = 400
+STARTUP_PAINT_BUDGET_MS = 1200
+# Per-file cost of handling rename results may grow this much from a quarter of the tracks to all of them
+RENAME_MAX_GROWTH = 2.0
+# Results per list a batch worker emits in the rename benchmark
+RENAME_BATCH_SIZE = 500
+
+
+def _startup_child():
+    """Runs in a fresh interpreter: starts the app the way main.py does and reports when it first paints."""
+    start = time.perf_counter()
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import QObject, QEvent, QTimer
+    from tagqt.ui.main import MainWindow
+    from tagqt.ui.theme import Theme
+    imported = time.perf_counter()
+
+    app = QApplication(sys.argv[:1])
+    app.setStyleSheet(Theme.get_stylesheet())
+
+    result = {}
+
+    class PaintWatcher(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint and not result:
+                result['import_ms'] = (imported - start) * 1000
+                result['paint_ms'] = (time.perf_counter() - start) * 1000
+                result['deferred_loaded'] = sorted(m for m in DEFERRED_MODULES if m in sys.modules)
+                QTimer.singleShot(0, app.quit)
+            return False
+
+    window = MainWindow()
+    watcher = PaintWatcher()
+    window.installEventFilter(watcher)
+    window.show()
+    # Offscreen runs may never expose the window, give up rather than hang
+    QTimer.singleShot(10000, app.quit)
+    app.exec()
+
+    print(json.dumps(result))
+    sys.stdout.flush()
+    # Skip interpreter teardown, it is not part of startup
+    os._exit(0)
+
+
+def bench_startup(runs):
+    env = dict(os.environ)
+    if not env.get('DISPLAY') and not env.get('WAYLAND_DISPLAY') and sys.platform.startswith('linux'):
+        env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-m', 'tagqt.utils.bench', '_startup_child'],
+                             capture_output=True, text=True, env=env)
+        lines = [line for line in out.stdout.splitlines() if line.startswith('{')]
+        if not lines or lines[-1] == '{}':
+            raise RuntimeError(f"Startup run did not paint a window: {out.stderr.strip()}")
+        samples.append(json.loads(lines[-1]))
+
+    return {
+        'import_ms': statistics.median(s['import_ms'] for s in samples),
+        'paint_ms': statistics.median(s['paint_ms'] for s in samples),
+        'deferred_loaded': sorted({m for s in samples for m in s['deferred_loaded']}),
+        'runs': runs,
+    }
+
+
+def _qt_app():
+    if not os.environ.get('DISPLAY') and not os.environ.get('WAYLAND_DISPLAY') and sys.platform.startswith('linux'):
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication(sys.argv[:1])
+
+
+def _synthetic_tracks(count):
+    from tagqt.core.library import TrackRecord
+    tracks = []
+    for i in range(count):
+        path = f"/bench/Artist {i % 300}/Album {i % 3000}/{i:06d} - Song {i}.flac"
+        tracks.append((path, TrackRecord(path, title=f"Song {i}", artist=f"Artist {i % 300}",
+                                         album=f"Album {i % 3000}", track_number=str(i % 12 + 1))))
+    return tracks
+
+
+def bench_rename(tracks, batch_size=RENAME_BATCH_SIZE):
+    """Times MainWindow.on_rename_results for every track of libraries of growing size.
+
+    Results are handed over in lists of batch_size, the way RenameWorker
+    delivers them, and the status dialog shows each list before the next, so
+    both the file list and the batch status model are measured.
+    """
+    app = _qt_app()
+    from tagqt.ui.main import MainWindow
+
+    sizes = [max(1, tracks // 4), max(1, tracks // 2), tracks]
+    per_file_us = []
+    for size in sizes:
+        window = MainWindow()
+        window.file_list.append_files(_synthetic_tracks(size))
+        window.change_display_mode("Album")
+        window._prepare_batch("Renaming Files")
+        app.processEvents()
+        results = [(path, "Success", f"Renamed to {os.path.basename(path)[:-5]} (renamed).flac")
+                   for path, _ in window.file_list.all_files]
+        start = time.perf_counter()
+        for i in range(0, size, batch_size):
+            window.on_rename_results(results[i:i + batch_size])
+            # What the dialog's flush timer does between two deliveries
+            window.batch_dialog.flush()
+        window.batch_dialog.set_finished()
+        app.processEvents()
+        per_file_us.append((time.perf_counter() - start) / size * 1e6)
+        window.batch_running = False
+        window.batch_dialog.deleteLater()
+        window.deleteLater()
+        app.processEvents()
+
+    return {
+        'sizes': sizes,
+        'per_file_us': per_file_us,
+        'growth': per_file_us[-1] / per_file_us[0] if per_file_us[0] else 0,
+    }
+
+
+def _record(path, name, result):
+    entry = dict(result, benchmark=name, time=time.strftime('%Y-%m-%dT%H:%M:%S'))
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry) + '\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m tagqt.utils.bench')
+    sub = parser.add_subparsers(dest='benchmark', required=True)
+
+    startup = sub.add_parser('startup', help="import time and time to first paint of the main window")
+    startup.add_argument('--runs', type=int, default=5)
+    startup.add_argument('--import-budget', type=float, default=STARTUP_IMPORT_BUDGET_MS, metavar='MS')
+    startup.add_argument('--paint-budget', type=float, default=STARTUP_PAINT_BUDGET_MS, metavar='MS')
+    startup.add_argument('--record', metavar='FILE', help="append the result as a JSON line")
+
+    rename = sub.add_parser('rename', help="handling of bulk rename results by the file list and status dialog")
+    rename.add_argument('--tracks', type=int, default=20000)
+    rename.add_argument('--max-growth', type=float, default=RENAME_MAX_GROWTH, metavar='X',
+                        help="allowed rise of the per-file time from a quarter of the tracks to all of them")
+    rename.add_argument('--record', metavar='FILE', help="append the result as a JSON line")
+
+    sub.add_parser('_startup_child')
+
+    args = parser.parse_args(argv)
+    if args.benchmark == '_startup_child':
+        _startup_child()
+        return 0
+    if args.benchmark == 'rename':
+        return _run_rename(args)
+
+    result = bench_startup(args.runs)
+    if args.record:
+        _record(args.record, 'startup', result)
+
+    failures = []
+    if result['import_ms'] > args.import_budget:
+        failures.append(f"import took {result['import_ms']:.0f} ms, budget {args.import_budget:.0f} ms")
+    if result['paint_ms'] > args.paint_budget:
+        failures.append(f"first paint took {result['paint_ms']:.0f} ms, budget {args.paint_budget:.0f} ms")
+    if result['deferred_loaded']:
+        failures.append(f"imported at startup: {', '.join(result['deferred_loaded'])}")
+
+    print(f"startup: import {result['import_ms']:.0f} ms, first paint {result['paint_ms']:.0f} ms "
+          f"(median of {result['runs']})")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+def _run_rename(args):
+    result = bench_rename(args.tracks)
+    if args.record:
+        _record(args.record, 'rename', result)
+
+    for size, us in zip(result['sizes'], result['per_file_us']):
+        print(f"rename: {size} tracks, {us:.1f} us per file")
+    if result['growth'] > args.max_growth:
+        print(f"FAIL: per-file time grew {result['growth']:.2f}x with {result['sizes'][-1] // result['sizes'][0]}x "
+              f"the tracks, limit {args.max_growth:.2f}x")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+import struct
+import zlib
+
+import pytest
+from mutagen.flac import FLAC, Picture
+from mutagen.id3 import APIC, ID3, TALB, TCON, TDRC, TIT2, TPE1, TPE2, TPOS, TRCK, USLT
+from mutagen.mp3 import MP3
+
+from tagqt.core.headers import read_tags
+
+
+def png(width, height):
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    ihdr = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', ihdr) + chunk(b'IDAT', zlib.compress(b'\0' * 64)) + chunk(b'IEND', b'')
+
+
+def write_flac(path, seconds=3, sample_rate=44100):
+    samples = seconds * sample_rate
+    packed = (sample_rate << 44) | (1 << 41) | (15 << 36) | samples
+    streaminfo = struct.pack('>HH', 4096, 4096) + b'\0' * 6 + packed.to_bytes(8, 'big') + b'\0' * 16
+    with open(path, 'wb') as f:
+        f.write(b'fLaC' + bytes([0x80]) + len(streaminfo).to_bytes(3, 'big') + streaminfo)
+        f.write(b'\xff\xf8' + b'\0' * 2000)
+
+
+def write_mp3(path, frames=100):
+    # MPEG-1 layer III, 128 kbps, 44.1 kHz: 417 byte frames
+    with open(path, 'wb') as f:
+        f.write((b'\xff\xfb\x90\x64' + b'\0' * 413) * frames)
+
+
+def test_flac_matches_mutagen(tmp_path):
+    path = str(tmp_path / "track.flac")
+    write_flac(path)
+    audio = FLAC(path)
+    audio['title'] = "Título"
+    audio['artist'] = "Artist"
+    audio['album'] = "Album"
+    audio['albumartist'] = "Album Artist"
+    audio['date'] = "1999"
+    audio['genre'] = "Ambient"
+    audio['tracknumber'] = "3"
+    audio['discnumber'] = "1"
+    audio['disctotal'] = "2"
+    audio['lyrics'] = "la " * 500
+    picture = Picture()
+    picture.type = 3
+    picture.mime = 'image/png'
+    picture.desc = "front"
+    picture.data = png(320, 240)
+    audio.add_picture(picture)
+    audio.save()
+
+    fields = read_tags(path)
+    audio = FLAC(path)
+    for key, field in [('title', 'title'), ('artist', 'artist'), ('album', 'album'),
+                       ('albumartist', 'album_artist'), ('date', 'year'), ('genre', 'genre'),
+                       ('tracknumber', 'track_number')]:
+        assert fields[field] == audio[key][0]
+    assert fields['disc_number'] == "1/2"
+    assert fields['duration'] == int(audio.info.length)
+    assert fields['sample_rate'] == audio.info.sample_rate // 1000
+
+    data = audio.pictures[0].data
+    assert fields['cover_size'] == len(data)
+    with open(path, 'rb') as f:
+        f.seek(fields['cover_offset'])
+        assert f.read(fields['cover_size']) == data
+    # Dimensions left at zero by the writer are read from the image
+    assert (fields['cover_width'], fields['cover_height']) == (320, 240)
+
+
+@pytest.mark.parametrize("version", [3, 4])
+def test_mp3_matches_mutagen(tmp_path, version):
+    path = str(tmp_path / "track.mp3")
+    write_mp3(path)
+    tags = ID3()
+    tags.add(TIT2(encoding=1, text="Título"))
+    tags.add(TPE1(encoding=3, text="Artist"))
+    tags.add(TALB(encoding=0, text="Album"))
+    tags.add(TPE2(encoding=3, text="Album Artist"))
+    tags.add(TDRC(encoding=3, text="1999-04-01"))
+    tags.add(TCON(encoding=3, text="(17)"))
+    tags.add(TRCK(encoding=3, text="3/10"))
+    tags.add(TPOS(encoding=3, text="1/2"))
+    tags.add(USLT(encoding=3, lang='eng', desc='', text="la " * 500))
+    # A UTF-16 description is the awkward case for finding where the image starts
+    tags.add(APIC(encoding=1, mime='image/png', type=3, desc="Cover", data=png(500, 400)))
+    tags.save(path, v2_version=version)
+
+    fields = read_tags(path)
+    audio = MP3(path)
+    for frame_id, field in [('TIT2', 'title'), ('TPE1', 'artist'), ('TALB', 'album'),
+                            ('TPE2', 'album_artist'), ('TRCK', 'track_number'), ('TPOS', 'disc_number')]:
+        assert fields[field] == audio.tags[frame_id].text[0]
+    assert fields['year'] == str(audio.tags['TDRC'].text[0])
+    assert fields['genre'] == audio.tags['TCON'].genres[0] == "Rock"
+    assert fields['duration'] == int(audio.info.length)
+    assert fields['bitrate'] == audio.info.bitrate // 1000
+    assert fields['sample_rate'] == audio.info.sample_rate // 1000
+
+    data = audio.tags.getall('APIC')[0].data
+    assert fields['cover_size'] == len(data)
+    with open(path, 'rb') as f:
+        f.seek(fields['cover_offset'])
+        assert f.read(fields['cover_size']) == data
+    assert (fields['cover_width'], fields['cover_height']) == (500, 400)
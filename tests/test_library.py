@@ -0,0 +1,34 @@
+import threading
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+from tagqt.core.library import parse_tracks
+
+
+class PoolThatDies:
+    """Parses the first batch, then behaves like a pool whose worker process was killed."""
+
+    def __init__(self, max_workers, mp_context=None):
+        self.submitted = 0
+
+    def submit(self, fn, paths):
+        self.submitted += 1
+        future = Future()
+        if self.submitted == 1:
+            future.set_result(fn(paths))
+        else:
+            future.set_exception(BrokenProcessPool("a worker process died"))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def test_broken_pool_falls_back_to_parsing_inline(monkeypatch, tmp_path):
+    monkeypatch.setattr("concurrent.futures.ProcessPoolExecutor", PoolThatDies)
+    paths = [str(tmp_path / f"{i:03d}.flac") for i in range(100)]
+
+    parsed = [path for batch in parse_tracks(paths, 2, threading.Event(), chunk_size=4)
+              for path, _record, _error in batch]
+
+    assert sorted(parsed) == paths
@@ -0,0 +1,74 @@
+import os
+import threading
+import time
+
+from tagqt.ui.covers import CoverLoader
+from tagqt.ui.loader import MetadataLoader
+
+
+def wait_for(qapp, results, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not results and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.01)
+    return results
+
+
+def test_unreadable_file_is_still_delivered(qapp, tmp_path):
+    path = str(tmp_path / "missing.flac")
+    loader = MetadataLoader()
+    results = []
+    loader.loaded.connect(lambda p, handler: results.append((p, handler)))
+    loader.request(path)
+    assert wait_for(qapp, results) == [(path, None)]
+
+
+def test_unreadable_cover_is_delivered_as_null_image(qapp, tmp_path):
+    path = str(tmp_path / "missing.flac")
+    loader = CoverLoader()
+    results = []
+    loader.loaded.connect(lambda p, image, resolution: results.append((p, image.isNull(), resolution)))
+    assert loader.request(path, None) is None
+    assert wait_for(qapp, results) == [(path, True, "")]
+
+
+def test_cover_memory_hit_does_not_stat_on_the_calling_thread(qapp, tmp_path, monkeypatch):
+    from PySide6.QtCore import QBuffer, QByteArray, QIODevice
+    from PySide6.QtGui import QImage
+    from mutagen.flac import FLAC, Picture
+    from tagqt.core.library import TrackRecord
+    from test_headers import write_flac
+
+    image = QImage(40, 40, QImage.Format_RGB32)
+    image.fill(0xff336699)
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    path = str(tmp_path / "track.flac")
+    write_flac(path)
+    audio = FLAC(path)
+    picture = Picture()
+    picture.mime = 'image/png'
+    picture.data = bytes(data)
+    audio.add_picture(picture)
+    audio.save()
+    record = TrackRecord.from_file(path)
+
+    loader = CoverLoader()
+    results = []
+    loader.loaded.connect(lambda p, image, resolution: results.append(resolution))
+    assert loader.request(path, record) is None
+    assert wait_for(qapp, results) == ["40x40"]
+
+    stats = []
+    real_stat = os.stat
+    main_thread = threading.current_thread()
+    def stat(*args, **kwargs):
+        if threading.current_thread() is main_thread:
+            stats.append(args[0])
+        return real_stat(*args, **kwargs)
+    monkeypatch.setattr(os, "stat", stat)
+    hit = loader.request(path, record)
+    assert hit is not None and hit[1] == "40x40"
+    assert stats == []
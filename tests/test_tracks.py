@@ -0,0 +1,37 @@
+from PySide6.QtCore import Qt
+
+from tagqt.core.library import TrackRecord
+from tagqt.ui.tracks import FileList
+
+
+def tracks(titles, folder):
+    return [(f"/{folder}/{i:02d}.flac", TrackRecord(f"/{folder}/{i:02d}.flac", title=title))
+            for i, title in enumerate(titles)]
+
+
+def shown_titles(file_list):
+    return [file_list.store.records[slot].title for slot in file_list.track_model.visible_slots()]
+
+
+def test_sort_survives_clearing_and_loading_another_folder(qapp):
+    file_list = FileList()
+    file_list.append_files(tracks(["b", "c", "a"], "old"))
+    file_list.sortByColumn(1, Qt.AscendingOrder)
+    assert shown_titles(file_list) == ["a", "b", "c"]
+
+    file_list.clear_files()
+    file_list.append_files(tracks(["e", "", "d", "a", "c"], "new"))
+    assert shown_titles(file_list) == ["a", "c", "d", "e", ""]
+
+    file_list.sortByColumn(1, Qt.DescendingOrder)
+    assert shown_titles(file_list) == ["e", "d", "c", "a", ""]
+
+
+def test_smaller_folder_is_sorted_by_its_own_keys(qapp):
+    file_list = FileList()
+    file_list.append_files(tracks(["a", "b", "c", "d"], "old"))
+    file_list.sortByColumn(1, Qt.AscendingOrder)
+
+    file_list.clear_files()
+    file_list.append_files(tracks(["z", "y"], "new"))
+    assert shown_titles(file_list) == ["y", "z"]